@@ -1,4 +1,3 @@
-import requests
 import traceback
 
 import bittensor as bt
@@ -106,7 +105,7 @@ class ABSController(Controller):
         remaining_tasks = max(0, num_task - len(challenge_inputs))
         if remaining_tasks > 0:
             challenge_inputs.extend(
-                [self._get_challenge_from_container() for _ in range(remaining_tasks)]
+                self._get_challenges_from_container(remaining_tasks)
             )
 
         bt.logging.debug(
@@ -130,11 +129,6 @@ class ABSController(Controller):
                     client=self.docker_client,
                     port=constants.MINER_DOCKER_PORT,
                 )
-                docker_utils.clean_docker_resources(
-                    client=self.docker_client,
-                    remove_containers=True,
-                    remove_images=False,
-                )
 
                 bt.logging.info(
                     f"[CONTROLLER - ABSController] Baseline reference scoring logs: {len(reference_commit.scoring_logs)}"
@@ -153,7 +147,7 @@ class ABSController(Controller):
             f"[CONTROLLER - ABSController] Starting miner scoring for {len(self.miner_commits)} miners"
         )
 
-        for miner_commit in self.miner_commits:
+        for i, miner_commit in enumerate(self.miner_commits, start=1):
             uid, hotkey = miner_commit.miner_uid, miner_commit.miner_hotkey
 
             try:
@@ -178,15 +172,17 @@ class ABSController(Controller):
                         )
                     )
 
+            # Clean up miner container, full cleanup runs only periodically since it lists all containers
             docker_utils.remove_container_by_port(
                 client=self.docker_client,
                 port=constants.MINER_DOCKER_PORT,
             )
-            docker_utils.clean_docker_resources(
-                client=self.docker_client,
-                remove_containers=True,
-                remove_images=False,
-            )
+            if i % self._CLEANUP_EVERY_N_MINERS == 0:
+                docker_utils.clean_docker_resources(
+                    client=self.docker_client,
+                    remove_containers=True,
+                    remove_images=False,
+                )
 
         bt.logging.debug(
             f"[CONTROLLER - ABSController] Challenge completed, cleaning up challenge container"
@@ -233,7 +229,7 @@ class ABSController(Controller):
                     miner_output=miner_commit.scoring_logs[0].miner_output,
                     task_id=i,
                 )
-                if miner_commit.scoring_logs[0].miner_output is not None
+                if self._is_scorable(miner_commit.scoring_logs[0].miner_output)
                 else 0.0
             )
 
@@ -246,13 +242,11 @@ class ABSController(Controller):
 
     def _get_scoring_results(self) -> dict:
         """Retrieve scoring results from the challenge container."""
-
-        _protocol, _ssl_verify = self._check_protocol(is_challenger=True)
         try:
             bt.logging.debug(f"[CONTROLLER] Getting scoring results ...")
-            response = requests.get(
-                f"{_protocol}://localhost:{constants.CHALLENGE_DOCKER_PORT}/results",
-                verify=_ssl_verify,
+            response = self.challenge_session.get(
+                self._challenger_base_url + "/results",
+                verify=self._challenger_ssl_verify,
             )
             scoring_results = response.json()
         except Exception as ex:
@@ -266,8 +260,11 @@ class ABSController(Controller):
             ABSController._baseline_reference_cache.values()
         )
 
-    def _exclude_output_keys(self, miner_output: dict, reference_output: dict):
-        miner_output["detection_js"] = None
-        reference_output["detection_js"] = None
-        miner_output["scoring_results"] = None
-        reference_output["scoring_results"] = None
+    def _exclude_output_keys(
+        self, miner_output: dict, reference_output: dict
+    ) -> tuple[dict, dict]:
+        _excluded = {"detection_js": None, "scoring_results": None}
+        return (
+            {**miner_output, **_excluded},
+            {**reference_output, **_excluded},
+        )
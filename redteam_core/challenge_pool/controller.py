@@ -3,11 +3,14 @@ import copy
 import time
 from typing import Union
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 import bittensor as bt
 import docker
 import docker.types
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from redteam_core.challenge_pool.base import BaseController
 from redteam_core.challenge_pool import docker_utils
@@ -18,6 +21,10 @@ from redteam_core.validator.models import (
 )
 from redteam_core.constants import constants
 
+# Request bodies are serialized with orjson, allowing non-str keys like stdlib json
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_JSON_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
 
 class Controller(BaseController):
     """
@@ -25,6 +32,11 @@ class Controller(BaseController):
     of Docker containers for the challenge and miners, as well as submitting and scoring tasks.
     """
 
+    # Default max concurrent requests to the challenge container
+    MAX_TASK_WORKERS = 16
+    # Run full docker cleanup after every N miners, the challenge end cleanup covers the rest
+    _CLEANUP_EVERY_N_MINERS = 10
+
     def __init__(
         self,
         challenge_name: str,
@@ -52,6 +64,31 @@ class Controller(BaseController):
 
         self.local_network = "redteam_local"
 
+        # Max concurrent requests to the challenge container, overridable per challenge
+        self.max_concurrency = max(
+            1, self.challenge_info.get("max_concurrency", self.MAX_TASK_WORKERS)
+        )
+        # Shared session for challenge container requests, to reuse keep-alive connections.
+        # The pool blocks at max_concurrency connections instead of opening extra ones.
+        self.challenge_session = requests.Session()
+        _adapter = HTTPAdapter(pool_maxsize=self.max_concurrency, pool_block=True)
+        self.challenge_session.mount("http://", _adapter)
+        self.challenge_session.mount("https://", _adapter)
+
+        # Protocols only depend on challenge info, resolve them and the base URLs once
+        self._challenger_protocol, self._challenger_ssl_verify = self._check_protocol(
+            is_challenger=True
+        )
+        self._miner_protocol, self._miner_ssl_verify = self._check_protocol(
+            is_challenger=False
+        )
+        self._challenger_base_url = (
+            f"{self._challenger_protocol}://localhost:{constants.CHALLENGE_DOCKER_PORT}"
+        )
+        self._miner_base_url = (
+            f"{self._miner_protocol}://localhost:{constants.MINER_DOCKER_PORT}"
+        )
+
         self.max_self_comparison_score = self.challenge_info["comparison_config"].get(
             "max_self_comparison_score", 0.9
         )
@@ -91,7 +128,7 @@ class Controller(BaseController):
         remaining_tasks = max(0, num_task - len(challenge_inputs))
         if remaining_tasks > 0:
             challenge_inputs.extend(
-                [self._get_challenge_from_container() for _ in range(remaining_tasks)]
+                self._get_challenges_from_container(remaining_tasks)
             )
 
         # Score baseline first if it exists
@@ -115,7 +152,7 @@ class Controller(BaseController):
                 bt.logging.error(traceback.format_exc())
 
         # Score commits with new input and collect comparison logs
-        for miner_commit in self.miner_commits:
+        for i, miner_commit in enumerate(self.miner_commits, start=1):
             uid, hotkey = miner_commit.miner_uid, miner_commit.miner_hotkey
 
             try:
@@ -144,16 +181,17 @@ class Controller(BaseController):
                         )
                     )
 
-            # Clean up miner container
+            # Clean up miner container, full cleanup runs only periodically since it lists all containers
             docker_utils.remove_container_by_port(
                 client=self.docker_client,
                 port=constants.MINER_DOCKER_PORT,
             )
-            docker_utils.clean_docker_resources(
-                client=self.docker_client,
-                remove_containers=True,
-                remove_images=True,
-            )
+            if i % self._CLEANUP_EVERY_N_MINERS == 0:
+                docker_utils.clean_docker_resources(
+                    client=self.docker_client,
+                    remove_containers=True,
+                    remove_images=True,
+                )
 
         # Clean up challenge container
         docker_utils.remove_container(
@@ -213,12 +251,11 @@ class Controller(BaseController):
         )
 
         # Check challenge container health
-        _protocol, _ssl_verify = self._check_protocol(is_challenger=True)
         docker_utils.check_container_alive(
             container=self.challenge_container,
             health_port=constants.CHALLENGE_DOCKER_PORT,
-            protocol=_protocol,
-            ssl_verify=_ssl_verify,
+            protocol=self._challenger_protocol,
+            ssl_verify=self._challenger_ssl_verify,
         )
 
     def _setup_miner_container(self, miner_commit: MinerChallengeCommit):
@@ -252,12 +289,11 @@ class Controller(BaseController):
         )
 
         # Check miner container health
-        _protocol, _ssl_verify = self._check_protocol(is_challenger=False)
         docker_utils.check_container_alive(
             container=miner_container,
             health_port=constants.MINER_DOCKER_PORT,
-            protocol=_protocol,
-            ssl_verify=_ssl_verify,
+            protocol=self._miner_protocol,
+            ssl_verify=self._miner_ssl_verify,
             timeout=self.challenge_info.get("docker_run_timeout", 600),
             start_time=miner_start_time,
         )
@@ -265,38 +301,57 @@ class Controller(BaseController):
     def _score_miner_with_new_inputs(
         self, miner_commit: MinerChallengeCommit, challenge_inputs
     ):
-        """Run and score miner with new challenge inputs."""
-        for i, miner_input in enumerate(challenge_inputs):
-            miner_output, error_message = self._submit_challenge_to_miner(miner_input)
-            score = (
-                self._score_challenge(
+        """Run and score miner with new challenge inputs.
+
+        The next miner request runs ahead on a background worker, so the miner produces the next
+        output while the current one is scored. Both still run one at a time and in input order.
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            next_future = (
+                executor.submit(self._submit_challenge_to_miner, challenge_inputs[0])
+                if challenge_inputs
+                else None
+            )
+            for i, miner_input in enumerate(challenge_inputs):
+                miner_output, error_message = next_future.result()
+                # Only one request is in flight, a scoring failure doesn't wait on the rest
+                if i + 1 < len(challenge_inputs):
+                    next_future = executor.submit(
+                        self._submit_challenge_to_miner, challenge_inputs[i + 1]
+                    )
+
+                score = (
+                    self._score_challenge(
+                        miner_input=miner_input,
+                        miner_output=miner_output,
+                        task_id=i,
+                    )
+                    if self._is_scorable(miner_output)
+                    else 0.0
+                )
+
+                log = ScoringLog(
                     miner_input=miner_input,
                     miner_output=miner_output,
-                    task_id=i,
+                    score=score,
+                    error=error_message,
                 )
-                if miner_output is not None
-                else 0.0
-            )
 
-            log = ScoringLog(
-                miner_input=miner_input,
-                miner_output=miner_output,
-                score=score,
-                error=error_message,
-            )
-
-            # Handle baseline scoring separately
-            if miner_commit.miner_hotkey == "baseline":
-                self.baseline_commit.scoring_logs.append(log)
-            else:
-                # Adjust score relative to baseline if baseline exists and has been scored
-                if (
-                    self.baseline_commit.docker_hub_id
-                    and len(self.baseline_commit.scoring_logs) > i
-                ):
-                    log.score -= self.baseline_commit.scoring_logs[i].score
-                    log.baseline_score = self.baseline_commit.scoring_logs[i].score
-                miner_commit.scoring_logs.append(log)
+                # Handle baseline scoring separately
+                if miner_commit.miner_hotkey == "baseline":
+                    self.baseline_commit.scoring_logs.append(log)
+                else:
+                    # Adjust score relative to baseline if baseline exists and has been scored
+                    if (
+                        self.baseline_commit.docker_hub_id
+                        and len(self.baseline_commit.scoring_logs) > i
+                    ):
+                        log.score -= self.baseline_commit.scoring_logs[i].score
+                        log.baseline_score = self.baseline_commit.scoring_logs[i].score
+                    miner_commit.scoring_logs.append(log)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _run_reference_comparison_inputs(self, miner_commit: MinerChallengeCommit):
         """
@@ -312,6 +367,8 @@ class Controller(BaseController):
             self._get_all_reference_commits() + current_commits_to_compare
         )
 
+        # Collect comparison jobs across all reference commits, so independent /compare requests run concurrently
+        _jobs: list[tuple[MinerChallengeCommit, ScoringLog]] = []
         for reference_commit in reference_commits:
             bt.logging.info(
                 f"[CONTROLLER] Running comparison with reference commit {reference_commit.docker_hub_id}"
@@ -332,42 +389,58 @@ class Controller(BaseController):
                     )
                     continue
 
-                _miner_output = miner_commit.scoring_logs[0].miner_output.copy()
-                _reference_output = reference_log.miner_output.copy()
-
-                _compare_result = self._compare_outputs(
-                    miner_input=reference_log.miner_input,
-                    miner_output=_miner_output,
-                    reference_output=_reference_output,
+                _jobs.append((reference_commit, reference_log))
+
+        _compare_results = []
+        if _jobs:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(_jobs))
+            ) as executor:
+                _compare_results = list(
+                    executor.map(
+                        lambda job: self._compare_outputs(
+                            miner_input=job[1].miner_input,
+                            miner_output=miner_commit.scoring_logs[0].miner_output,
+                            reference_output=job[1].miner_output,
+                        ),
+                        _jobs,
+                    )
                 )
-                _similarity_score = _compare_result.get("similarity_score", 1.0)
-                _similarity_reason = _compare_result.get("reason", "Unknown")
-
-                self._exclude_output_keys(_miner_output, _reference_output)
 
-                if (
-                    miner_commit.miner_hotkey == reference_commit.miner_hotkey
-                    and _similarity_score < self.max_self_comparison_score
-                ):
-                    bt.logging.warning(
-                        f"[CONTROLLER] Skipping self-comparison for {miner_commit.miner_hotkey} with {reference_commit.miner_hotkey} due to low similarity score {_similarity_score}"
-                    )
-                    continue
+        # Results are in job order, so logs keep the same order per reference commit
+        for (reference_commit, reference_log), _compare_result in zip(
+            _jobs, _compare_results
+        ):
+            _similarity_score = _compare_result.get("similarity_score", 1.0)
+            _similarity_reason = _compare_result.get("reason", "Unknown")
 
-                comparison_log = ComparisonLog(
-                    miner_input=reference_log.miner_input,
-                    miner_output=_miner_output,
-                    reference_output=_reference_output,
-                    reference_hotkey=reference_commit.miner_hotkey,
-                    reference_similarity_score=reference_commit.penalty,
-                    similarity_score=_similarity_score,
-                    reason=_similarity_reason,
+            if (
+                miner_commit.miner_hotkey == reference_commit.miner_hotkey
+                and _similarity_score < self.max_self_comparison_score
+            ):
+                bt.logging.warning(
+                    f"[CONTROLLER] Skipping self-comparison for {miner_commit.miner_hotkey} with {reference_commit.miner_hotkey} due to low similarity score {_similarity_score}"
                 )
+                continue
 
-                miner_commit.comparison_logs[reference_commit.docker_hub_id].append(
-                    comparison_log
-                )
+            _miner_output, _reference_output = self._exclude_output_keys(
+                miner_commit.scoring_logs[0].miner_output, reference_log.miner_output
+            )
+            comparison_log = ComparisonLog(
+                miner_input=reference_log.miner_input,
+                miner_output=_miner_output,
+                reference_output=_reference_output,
+                reference_hotkey=reference_commit.miner_hotkey,
+                reference_similarity_score=reference_commit.penalty,
+                similarity_score=_similarity_score,
+                reason=_similarity_reason,
+            )
+
+            miner_commit.comparison_logs[reference_commit.docker_hub_id].append(
+                comparison_log
+            )
 
+        for reference_commit in reference_commits:
             if (
                 reference_commit.docker_hub_id in miner_commit.comparison_logs
                 and not miner_commit.comparison_logs[reference_commit.docker_hub_id]
@@ -381,35 +454,83 @@ class Controller(BaseController):
     def _generate_scoring_logs(
         self, miner_commit: MinerChallengeCommit, challenge_inputs
     ):
-        """Run and score miner with new challenge inputs."""
-        for miner_input in challenge_inputs:
-            miner_output, error_message = self._submit_challenge_to_miner(miner_input)
+        """Run and score miner with new challenge inputs.
 
-            if miner_output is None or error_message:
-                bt.logging.warning(
-                    f"[CONTROLLER - ABSController] Miner {miner_commit.miner_hotkey} failed to produce output for reference comparison: {error_message}"
-                )
+        Each input's log is recorded as soon as it completes, so a failing input doesn't discard earlier ones.
+        If `max_consecutive_miner_errors` is set in challenge info, remaining inputs are skipped
+        (recorded as errors) after that many consecutive failures, e.g. when the miner container is down.
+        Up to `miner_concurrency` (challenge info, defaults to 1) inputs are submitted to the miner at once,
+        results are still processed in input order.
+        """
+        max_consecutive_errors = self.challenge_info.get(
+            "max_consecutive_miner_errors", None
+        )
+        miner_concurrency = max(1, self.challenge_info.get("miner_concurrency", 1))
+        consecutive_errors = 0
+        num_inputs = len(challenge_inputs)
+        executor = ThreadPoolExecutor(
+            max_workers=min(miner_concurrency, max(1, num_inputs))
+        )
+        try:
+            futures = [
+                executor.submit(self._submit_challenge_to_miner, miner_input)
+                for miner_input in challenge_inputs
+            ]
+            for i, (miner_input, future) in enumerate(zip(challenge_inputs, futures)):
+                if (
+                    max_consecutive_errors
+                    and consecutive_errors >= max_consecutive_errors
+                ):
+                    miner_commit.scoring_logs.insert(
+                        0,
+                        ScoringLog(
+                            miner_input=miner_input,
+                            miner_output=None,
+                            error=f"[Not Accepted] Skipped after {consecutive_errors} consecutive errors",
+                        ),
+                    )
+                    future.cancel()
+                    continue
+
+                try:
+                    miner_output, error_message = future.result()
+                except Exception as e:
+                    miner_output, error_message = None, f"Submit challenge failed: {e}"
+
+                if miner_output is None or error_message:
+                    consecutive_errors += 1
+                    bt.logging.warning(
+                        f"[CONTROLLER] Miner {miner_commit.miner_hotkey} failed to produce output for input {i + 1}/{num_inputs}: {error_message}"
+                    )
+                    miner_commit.scoring_logs.insert(
+                        0,
+                        ScoringLog(
+                            miner_input=miner_input,
+                            miner_output=None,
+                            error=(
+                                f"[Not Accepted] {error_message}"
+                                if error_message
+                                else "[Not Accepted] No output from miner"
+                            ),
+                        ),
+                    )
+                    continue
+
+                consecutive_errors = 0
                 miner_commit.scoring_logs.insert(
                     0,
                     ScoringLog(
                         miner_input=miner_input,
-                        miner_output=None,
-                        error=(
-                            f"[Not Accepted] {error_message}"
-                            if error_message
-                            else "[Not Accepted] No output from miner"
-                        ),
+                        miner_output=miner_output,
+                        error=error_message,
                     ),
                 )
-                continue
-            miner_commit.scoring_logs.insert(
-                0,
-                ScoringLog(
-                    miner_input=miner_input,
-                    miner_output=miner_output,
-                    error=error_message,
-                ),
-            )
+                bt.logging.debug(
+                    f"[CONTROLLER] Miner {miner_commit.miner_hotkey} produced output for input {i + 1}/{num_inputs}"
+                )
+        finally:
+            # Drop queued miner requests on failure, only running ones are awaited
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _compare_outputs(
         self, miner_input: dict, miner_output: dict, reference_output: dict
@@ -425,8 +546,6 @@ class Controller(BaseController):
         Returns:
             dict: Comparison score between 0 and 1, and reason for the score
         """
-        _protocol, _ssl_verify = self._check_protocol(is_challenger=True)
-
         try:
             payload = {
                 "miner_input": miner_input,
@@ -434,14 +553,15 @@ class Controller(BaseController):
                 "reference_output": reference_output,
             }
 
-            response = requests.post(
-                f"{_protocol}://localhost:{constants.CHALLENGE_DOCKER_PORT}/compare",
+            response = self.challenge_session.post(
+                self._challenger_base_url + "/compare",
                 timeout=self.challenge_info.get("challenge_compare_timeout", 60),
-                verify=_ssl_verify,
-                json=payload,
+                verify=self._challenger_ssl_verify,
+                data=orjson.dumps(payload, option=_JSON_DUMPS_OPTIONS),
+                headers=_JSON_HEADERS,
             )
 
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             data = response_data.get("data", {})
             similarity_score = data.get("similarity_score", 1.0)
             similarity_reason = data.get("reason", "Unknown")
@@ -471,17 +591,18 @@ class Controller(BaseController):
         """
 
         error_message = ""
-        miner_input = copy.deepcopy(challenge_input)
+        # Only top-level keys are replaced and the input is just serialized, so a shallow copy is enough
+        miner_input = copy.copy(challenge_input)
         exclude_miner_input_key = self.challenge_info.get("exclude_miner_input_key", [])
         for key in exclude_miner_input_key:
             miner_input[key] = None
         try:
-            _protocol, _ssl_verify = self._check_protocol(is_challenger=False)
             response = requests.post(
-                f"{_protocol}://localhost:{constants.MINER_DOCKER_PORT}/solve",
+                self._miner_base_url + "/solve",
                 timeout=self.challenge_info.get("challenge_solve_timeout", 60),
-                verify=_ssl_verify,
-                json=miner_input,
+                verify=self._miner_ssl_verify,
+                data=orjson.dumps(miner_input, option=_JSON_DUMPS_OPTIONS),
+                headers=_JSON_HEADERS,
             )
 
             if not response.ok:
@@ -489,7 +610,16 @@ class Controller(BaseController):
                 bt.logging.warning(error_message)
                 return None, error_message
 
-            return response.json(), error_message
+            miner_output = orjson.loads(response.content)
+            if not isinstance(miner_output, dict):
+                _output_type = type(miner_output).__name__
+                error_message = (
+                    f"Miner output must be a JSON object, got {_output_type}"
+                )
+                bt.logging.warning(error_message)
+                return None, error_message
+
+            return miner_output, error_message
         except requests.exceptions.Timeout:
             error_message = "Timeout occurred while trying to solve challenge."
             bt.logging.error(error_message)
@@ -511,21 +641,47 @@ class Controller(BaseController):
         Raises:
             Exception: If all retry attempts fail
         """
-        _protocol, _ssl_verify = self._check_protocol(is_challenger=True)
-        url = f"{_protocol}://localhost:{constants.CHALLENGE_DOCKER_PORT}/task"
+        url = self._challenger_base_url + "/task"
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, verify=_ssl_verify)
+                response = self.challenge_session.get(
+                    url, verify=self._challenger_ssl_verify
+                )
                 response.raise_for_status()
-                return response.json()
+                return orjson.loads(response.content)
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise Exception(
                         f"Failed to get challenge after {max_retries} attempts: {str(e)}"
                     )
 
+    def _get_challenges_from_container(self, num_tasks: int) -> list[dict]:
+        """
+        Retrieves multiple challenge inputs from the challenge container concurrently.
+
+        Args:
+            num_tasks: Number of challenge inputs to retrieve.
+
+        Returns:
+            A list of challenge inputs, in request order.
+
+        Raises:
+            Exception: If any challenge input could not be retrieved
+        """
+        if num_tasks <= 0:
+            return []
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, num_tasks)
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda _: self._get_challenge_from_container(), range(num_tasks)
+                )
+            )
+
     def _score_challenge(self, miner_input, miner_output, task_id: int = 0) -> float:
         """
         Submits the miner's input and output for scoring by making an HTTP POST request to the challenge container.
@@ -540,8 +696,6 @@ class Controller(BaseController):
             A float representing the score for the miner's solution.
         """
 
-        _protocol, _ssl_verify = self._check_protocol(is_challenger=True)
-
         _reset_challenge = False
         if task_id == 0:
             _reset_challenge = self.challenge_info.get("reset_challenge", False)
@@ -556,21 +710,37 @@ class Controller(BaseController):
                 "miner_output": miner_output,
             }
             bt.logging.debug(f"[CONTROLLER] Scoring payload: {str(payload)[:100]}...")
-            response = requests.post(
-                f"{_protocol}://localhost:{constants.CHALLENGE_DOCKER_PORT}/score{_reset_query}",
-                verify=_ssl_verify,
-                json=payload,
+            response = self.challenge_session.post(
+                self._challenger_base_url + "/score" + _reset_query,
+                verify=self._challenger_ssl_verify,
+                data=orjson.dumps(payload, option=_JSON_DUMPS_OPTIONS),
+                headers=_JSON_HEADERS,
             )
-            score = response.json()
+            response.raise_for_status()
+            score = orjson.loads(response.content)
         except Exception as ex:
             bt.logging.error(f"Score challenge failed: {str(ex)}")
             score = 0.0
 
-        if isinstance(score, int):
-            score = float(score)
-        elif not isinstance(score, float):
-            score = 0.0
-        return score
+        return float(score) if isinstance(score, (int, float)) else 0.0
+
+    def _is_scorable(self, miner_output) -> bool:
+        """
+        Checks whether the miner output is worth sending to the challenge container for scoring.
+        Missing, empty or non-dict outputs, or outputs without the `required_output_keys` from
+        challenge info, could only score 0, so the HTTP round-trip is skipped for them.
+
+        Args:
+            miner_output: The output generated by the miner.
+
+        Returns:
+            bool: True if the output should be scored by the challenge container.
+        """
+        if not isinstance(miner_output, dict) or not miner_output:
+            return False
+
+        required_output_keys = self.challenge_info.get("required_output_keys", [])
+        return all(key in miner_output for key in required_output_keys)
 
     def _check_protocol(
         self, is_challenger: bool = True
@@ -624,10 +794,13 @@ class Controller(BaseController):
         return self.reference_comparison_commits
 
     @abstractmethod
-    def _exclude_output_keys(self, miner_output: dict, reference_output: dict):
+    def _exclude_output_keys(
+        self, miner_output: dict, reference_output: dict
+    ) -> tuple[dict, dict]:
         """
         Exclude specific keys from outputs to prevent database bloat.
         Override in specialized controllers to specify which keys to exclude.
+        Must not mutate the given outputs, return new dicts instead.
         """
         # Default implementation - no exclusions
-        pass
+        return dict(miner_output), dict(reference_output)
@@ -105,7 +105,7 @@ class DFPController(Controller):
         remaining_tasks = max(0, num_task - len(challenge_inputs))
         if remaining_tasks > 0:
             challenge_inputs.extend(
-                [self._get_challenge_from_container() for _ in range(remaining_tasks)]
+                self._get_challenges_from_container(remaining_tasks)
             )
 
         bt.logging.debug(
@@ -129,11 +129,6 @@ class DFPController(Controller):
                     client=self.docker_client,
                     port=constants.MINER_DOCKER_PORT,
                 )
-                docker_utils.clean_docker_resources(
-                    client=self.docker_client,
-                    remove_containers=True,
-                    remove_images=False,
-                )
 
                 bt.logging.info(
                     f"[CONTROLLER - DFPController] Baseline reference scoring logs: {len(reference_commit.scoring_logs)}"
@@ -152,7 +147,7 @@ class DFPController(Controller):
             f"[CONTROLLER - DFPController] Starting miner scoring for {len(self.miner_commits)} miners"
         )
 
-        for miner_commit in self.miner_commits:
+        for i, miner_commit in enumerate(self.miner_commits, start=1):
             uid, hotkey = miner_commit.miner_uid, miner_commit.miner_hotkey
 
             try:
@@ -177,15 +172,17 @@ class DFPController(Controller):
                         )
                     )
 
+            # Clean up miner container, full cleanup runs only periodically since it lists all containers
             docker_utils.remove_container_by_port(
                 client=self.docker_client,
                 port=constants.MINER_DOCKER_PORT,
             )
-            docker_utils.clean_docker_resources(
-                client=self.docker_client,
-                remove_containers=True,
-                remove_images=False,
-            )
+            if i % self._CLEANUP_EVERY_N_MINERS == 0:
+                docker_utils.clean_docker_resources(
+                    client=self.docker_client,
+                    remove_containers=True,
+                    remove_images=False,
+                )
 
         bt.logging.debug(
             f"[CONTROLLER - DFPController] Challenge completed, cleaning up challenge container"
@@ -232,7 +229,7 @@ class DFPController(Controller):
                     miner_output=miner_commit.scoring_logs[0].miner_output,
                     task_id=i,
                 )
-                if miner_commit.scoring_logs[0].miner_output is not None
+                if self._is_scorable(miner_commit.scoring_logs[0].miner_output)
                 else 0.0
             )
 
@@ -243,6 +240,10 @@ class DFPController(Controller):
             DFPController._baseline_reference_cache.values()
         )
 
-    def _exclude_output_keys(self, miner_output: dict, reference_output: dict):
-        miner_output["fingerprinter_js"] = None
-        reference_output["fingerprinter_js"] = None
+    def _exclude_output_keys(
+        self, miner_output: dict, reference_output: dict
+    ) -> tuple[dict, dict]:
+        return (
+            {**miner_output, "fingerprinter_js": None},
+            {**reference_output, "fingerprinter_js": None},
+        )
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
 import logging
 from typing_extensions import Self
 
+import orjson
 from pydantic import Field, constr, field_validator, ValidationInfo, model_validator
 from pydantic_settings import SettingsConfigDict
 
@@ -85,8 +85,8 @@ class MainConfig(FrozenBaseConfig):
 
         _devices: list[dict] = []
         try:
-            with open(_devices_path, "r", encoding="utf-8") as _file:
-                _devices: list[dict] = json.load(_file)
+            with open(_devices_path, "rb") as _file:
+                _devices: list[dict] = orjson.loads(_file.read())
 
             if not isinstance(_devices, list):
                 raise ValueError(
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import threading
 from enum import Enum
 from typing import Optional
 
 from pydantic import (
     BaseModel,
     Field,
+    PrivateAttr,
     constr,
     conint,
     SecretStr,
@@ -48,6 +50,32 @@ class DevicePM(BaseModel):
     state: DeviceStateEnum = Field(default=DeviceStateEnum.NOT_SET)
     status: DeviceStatusEnum = Field(default=DeviceStatusEnum.ACTIVE)
 
+    _completed_event: threading.Event = PrivateAttr(default_factory=threading.Event)
+
+    def __copy__(self) -> "DevicePM":
+        _copy = super().__copy__()
+        # Each copy (e.g. from `model_copy()`) must track its own completion:
+        _copy._completed_event = threading.Event()
+        return _copy
+
+    def set_completed(self) -> None:
+        """Mark device as COMPLETED and wake up any thread waiting on it."""
+
+        self.state = DeviceStateEnum.COMPLETED
+        self._completed_event.set()
+
+    def wait_completed(self, timeout: float) -> bool:
+        """Block until the device is marked as COMPLETED or the timeout expires.
+
+        Args:
+            timeout (float, required): Maximum time to wait in seconds.
+
+        Returns:
+            bool: True if the device completed within the timeout, False otherwise.
+        """
+
+        return self._completed_event.wait(timeout=timeout)
+
 
 class DeviceConfig(DevicePM, FrozenBaseConfig):
     pass
@@ -105,6 +133,7 @@ class ChallengeConfig(FrozenBaseConfig):
     fp_timeout: conint(ge=1) = Field(...)  # type: ignore
     proxy_inter_base_url: AnyHttpUrl = Field(...)
     proxy_exter_base_url: AnyHttpUrl = Field(...)
+    proxy_gzip_fp_js: bool = Field(default=False)
     devices_fname: constr(strip_whitespace=True, min_length=2, max_length=256) = Field(  # type: ignore
         ...
     )
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
 import requests
-from pydantic import validate_call
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from api.core.constants import ErrorCodeEnum
 from api.core import utils
@@ -11,7 +12,19 @@ from api.config import config
 from api.logger import logger
 
 
-@validate_call
+_HEALTH_TIMEOUT = (3.05, 30)
+
+_session = requests.Session()
+_session.headers.update({"Accept": "application/json"})
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=1, backoff_factor=0.1),
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
 def check_health(request_id: str) -> dict:
 
     _base_response = {
@@ -41,12 +54,11 @@ def check_health(request_id: str) -> dict:
         f"[{request_id}] - Checking health of DFP proxy server and devices with URL '{_url}'..."
     )
     _headers = {
-        "Accept": "application/json",
         "X-API-Key": config.challenge.api_key.get_secret_value(),
     }
     _response = None
     try:
-        _response = requests.get(_url, headers=_headers)
+        _response = _session.get(_url, headers=_headers, timeout=_HEALTH_TIMEOUT)
         try:
             _response_json = _response.json()
         except ValueError as e:
@@ -1,15 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import ipaddress
 import subprocess
+from functools import lru_cache
 
-from pydantic import validate_call, IPvAnyAddress, IPvAnyNetwork
+from pydantic import IPvAnyAddress, IPvAnyNetwork
 
 
 logger = logging.getLogger(__name__)
 
 
-@validate_call
 def is_reachable(host: str, timeout: int = 3) -> bool:
     """Check if a host is reachable by pinging it.
 
@@ -48,22 +49,29 @@ def is_reachable(host: str, timeout: int = 3) -> bool:
     return False
 
 
-@validate_call
-def is_ip_in_range(ip: IPvAnyAddress, cidr: IPvAnyNetwork) -> bool:
+@lru_cache(maxsize=1024)
+def _is_ip_in_range_cached(ip: str, cidr: str) -> bool:
+    return ipaddress.ip_address(ip) in ipaddress.ip_network(cidr)
+
+
+def is_ip_in_range(ip: IPvAnyAddress | str, cidr: IPvAnyNetwork | str) -> bool:
     """Check if an IP address is within a given CIDR range.
 
+    Results are cached by the string form of the arguments, since the same device IPs are checked against the same
+    CIDR ranges repeatedly.
+
     Args:
-        ip   (IPvAnyAddress, required): IP address to check.
-        cidr (IPvAnyNetwork, required): CIDR range to check against.
+        ip   (IPvAnyAddress | str, required): IP address to check.
+        cidr (IPvAnyNetwork | str, required): CIDR range to check against.
+
+    Raises:
+        ValueError: If `ip` or `cidr` argument value is invalid.
 
     Returns:
         bool: True if the IP address is within the CIDR range, False otherwise.
     """
 
-    if ip in cidr:
-        return True
-
-    return False
+    return _is_ip_in_range_cached(str(ip), str(cidr))
 
 
 __all__ = [
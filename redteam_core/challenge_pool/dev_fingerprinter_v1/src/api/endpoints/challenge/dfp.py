@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import gzip
 import random
-from typing import Optional, List, Dict, Set
-from collections import Counter, defaultdict
+from typing import Optional, List, Dict, Set, Tuple
+from collections import defaultdict
 from itertools import combinations
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pydantic import validate_call, AnyHttpUrl, SecretStr
 
 from api.core.configs.challenge import DevicePM, DeviceStatusEnum, DeviceStateEnum
@@ -14,13 +18,25 @@ from api.logger import logger
 from api.config import config
 
 
+_SEND_FP_JS_TIMEOUT = (3.05, 30)
+
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2))
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def _format_models(device_models: Dict[int, Optional[str]], dev_ids: Set[int]) -> str:
+    _models = {device_models[_id] for _id in dev_ids}
+    return ",".join(sorted([m if m is not None else "UNKNOWN" for m in _models]))
+
+
 class DFPManager:
 
     @validate_call
     def __init__(self, fp_js: str):
         self.fp_js = fp_js
 
-    @validate_call
     def send_fp_js(
         self, request_id: str, base_url: AnyHttpUrl, api_key: SecretStr
     ) -> None:
@@ -38,8 +54,14 @@ class DFPManager:
                 "Accept": "application/json",
                 "X-API-Key": api_key.get_secret_value(),
             }
-            _payload = {"fingerprinter_js": self.fp_js}
-            _response = requests.post(_url, headers=_headers, json=_payload)
+            _body = orjson.dumps({"fingerprinter_js": self.fp_js})
+            if config.challenge.proxy_gzip_fp_js:
+                _body = gzip.compress(_body, compresslevel=6)
+                _headers["Content-Encoding"] = "gzip"
+
+            _response = _session.post(
+                _url, headers=_headers, data=_body, timeout=_SEND_FP_JS_TIMEOUT
+            )
             _response.raise_for_status()
 
             logger.info(
@@ -53,56 +75,64 @@ class DFPManager:
 
         return
 
-    @validate_call
     def generate_targets(
         self, devices: list[DevicePM], n_repeat: int, random_seed: Optional[int] = None
     ) -> None:
 
         _target_devices = []
+        # Devices usually share the same Pushcut account, so fetch servers only once per API key:
+        _servers_by_api_key: Dict[str, List[dict]] = {}
         for _device in devices:
             if _device.status == DeviceStatusEnum.ACTIVE:
 
-                _pushcut = Pushcut(api_key=_device.pushcut_api_key)
-                _pushcut_servers = _pushcut.get_servers()
+                _api_key = _device.pushcut_api_key.get_secret_value()
+                if _api_key not in _servers_by_api_key:
+                    _pushcut = Pushcut(api_key=_device.pushcut_api_key)
+                    _servers_by_api_key[_api_key] = _pushcut.get_servers()
+
+                _pushcut_servers = _servers_by_api_key[_api_key]
                 if not _pushcut_servers:
                     logger.warning(
                         f"Device with {{'id': {_device.id}, 'pushcut_id': '{_device.pushcut_id}'}} has no pushcut live servers, skipping..."
                     )
                     continue
 
-                _is_pushcut_server_running = True
-                for _pushcut_server in _pushcut_servers:
-                    if (_pushcut_server.get("id") == _device.pushcut_server_id) and (
-                        not _pushcut_server.get("isConnected", False)
-                    ):
+                if _device.pushcut_server_id:
+                    _pushcut_server = next(
+                        (
+                            _server
+                            for _server in _pushcut_servers
+                            if _server.get("id") == _device.pushcut_server_id
+                        ),
+                        None,
+                    )
+                    if _pushcut_server is None:
                         logger.warning(
-                            f"Device with {{'id': {_device.id}, 'pushcut_id': '{_device.pushcut_id}', 'server_id': '{_device.pushcut_server_id}'}} live server is not connected, skipping..."
+                            f"Device with {{'id': {_device.id}, 'pushcut_id': '{_device.pushcut_id}', 'server_id': '{_device.pushcut_server_id}'}} live server is not found, skipping..."
                         )
-                        _is_pushcut_server_running = False
+                        continue
 
-                if not _is_pushcut_server_running:
-                    continue
+                    if not _pushcut_server.get("isConnected", False):
+                        logger.warning(
+                            f"Device with {{'id': {_device.id}, 'pushcut_id': '{_device.pushcut_id}', 'server_id': '{_device.pushcut_server_id}'}} live server is not connected, skipping..."
+                        )
+                        continue
 
+                # Validate once per device, repeats are cheap shallow copies:
+                _target_device = DevicePM(
+                    **_device.model_dump(exclude={"state"}),
+                    state=DeviceStateEnum.READY,
+                )
                 for _ in range(n_repeat):
-                    _target_devices.append(
-                        DevicePM(
-                            **_device.model_dump(exclude={"state"}),
-                            state=DeviceStateEnum.READY,
-                        )
-                    )
+                    _target_devices.append(_target_device.model_copy())
 
         if not _target_devices:
             raise ValueError(
                 "Not found any active or connected devices to generate targets!"
             )
 
-        if random_seed is not None:
-            random.seed(random_seed)
-
-        random.shuffle(_target_devices)
-
-        if random_seed is not None:
-            random.seed(None)
+        # Local RNG instance, so seeding doesn't touch the global random state:
+        random.Random(random_seed).shuffle(_target_devices)
 
         self.target_devices = _target_devices
         return
@@ -116,6 +146,11 @@ class DFPManager:
         sc_config = config.challenge.scoring
         weights = sc_config.weights
         thresholds = sc_config.thresholds
+        # Bind nested config values once, instead of walking the model attributes inside loops
+        frag_pct = thresholds.fragmentation.frag_pct
+        consistency_pct = 1 - thresholds.fragmentation.inconsistency_pct
+        soft_pct = thresholds.collision.soft_pct
+        hard_pct = thresholds.collision.hard_pct
 
         # Filter out devices with ERROR state
         total_target_devices = len(self.target_devices)
@@ -140,53 +175,69 @@ class DFPManager:
             logger.warning("No valid devices to score (all devices have ERROR state).")
             return 0.0
 
-        # Aggregate data
-        device_fingerprints: Dict[int, List[Optional[str]]] = defaultdict(list)
-        device_models: Dict[int, Optional[str]] = {}
+        # Debug messages in the loops below are only formatted when DEBUG level is enabled
+        _logger_lazy = logger.opt(lazy=True)
+
+        # Aggregate data (single pass)
+        device_request_counts: Dict[int, int] = defaultdict(int)
+        device_models: Dict[int, Optional[str]] = {
+            r.id: r.device_model for r in valid_devices
+        }
         fingerprint_to_devices: Dict[str, Set[int]] = defaultdict(set)
+        # Per device running count of each fingerprint, and the most frequent one's count:
+        device_fp_counts: Dict[Tuple[int, str], int] = defaultdict(int)
+        device_max_freq: Dict[int, int] = defaultdict(int)
 
         for r in valid_devices:
-            device_fingerprints[r.id].append(r.fingerprint)
-            device_models.setdefault(r.id, r.device_model)
+            device_request_counts[r.id] += 1
             if r.fingerprint:
                 fingerprint_to_devices[r.fingerprint].add(r.id)
+                _key = (r.id, r.fingerprint)
+                device_fp_counts[_key] += 1
+                if device_max_freq[r.id] < device_fp_counts[_key]:
+                    device_max_freq[r.id] = device_fp_counts[_key]
 
-        total_devices = len(device_fingerprints)
+        total_devices = len(device_request_counts)
         if total_devices == 0:
             return 0.0  # Edge case: no devices
 
         # Calculate dynamic limits
-        max_allowed_fragmented = max(
-            1, round(thresholds.fragmentation.frag_pct * total_devices)
-        )
-        soft_collision_limit = max(
-            1, round(thresholds.collision.soft_pct * total_devices)
-        )
-        hard_collision_limit = max(
-            1, round(thresholds.collision.hard_pct * total_devices)
-        )
+        max_allowed_fragmented = max(1, round(frag_pct * total_devices))
+        soft_collision_limit = max(1, round(soft_pct * total_devices))
+        hard_collision_limit = max(1, round(hard_pct * total_devices))
 
         # Fragmentation check
         fragmented_count = 0
-        for device_id, fps in device_fingerprints.items():
-            total_requests = len(fps)
-            if total_requests == 0 or not any(fps):
+        for device_id, total_requests in device_request_counts.items():
+            freq = device_max_freq[device_id]
+            if total_requests == 0 or freq == 0:
                 fragmented_count += 1
                 continue
-            min_consistent_count = round(
-                (1 - thresholds.fragmentation.inconsistency_pct) * total_requests
-            )
-            _, freq = Counter([fp for fp in fps if fp]).most_common(1)[0]
+            min_consistent_count = round(consistency_pct * total_requests)
             if freq < min_consistent_count:
-                logger.debug(
-                    f"Device {device_id} is fragmented: {freq}/{total_requests} consistent fingerprints."
+                _logger_lazy.debug(
+                    "{}",
+                    lambda: f"Device {device_id} is fragmented: {freq}/{total_requests} consistent fingerprints.",
                 )
                 fragmented_count += 1
 
+        # Integer-encode device models (-1 for unknown), so collision groups compare ints instead of building sets
+        model_id_map: Dict[str, int] = {
+            m: i
+            for i, m in enumerate({m for m in device_models.values() if m is not None})
+        }
+        device_model_ids: Dict[int, int] = {
+            d: model_id_map.get(m, -1) for d, m in device_models.items()
+        }
+
         # Collision check (group-level, one event per fingerprint)
         soft_collision_count = 0
         hard_collision_count = 0
-        for fp, dev_ids in fingerprint_to_devices.items():
+        hard_collision_fail_limit = hard_collision_limit * 2
+        # Largest groups first, so the hard fail guardrail trips as early as possible
+        for fp, dev_ids in sorted(
+            fingerprint_to_devices.items(), key=lambda kv: len(kv[1]), reverse=True
+        ):
             num_devices_in_group = len(dev_ids)
             if num_devices_in_group < 2:
                 continue
@@ -194,44 +245,38 @@ class DFPManager:
             # This represents N-1 collisions for a group of N devices.
             collision_magnitude = num_devices_in_group - 1
 
-            models = {device_models.get(d) for d in dev_ids}
+            model_ids = [device_model_ids[d] for d in dev_ids]
+            min_model_id = min(model_ids)
 
             # Soft only when all models are the same and known
-            if len(models) == 1 and None not in models:
-                model = next(iter(models))
-                logger.debug(
-                    f"Soft collision group: fingerprint {fp} on {num_devices_in_group} devices of model {model}."
+            if min_model_id == max(model_ids) and min_model_id != -1:
+                _logger_lazy.debug(
+                    "{}",
+                    lambda: f"Soft collision group: fingerprint {fp} on {num_devices_in_group} devices of model {device_models[next(iter(dev_ids))]}.",
                 )
                 soft_collision_count += collision_magnitude
             else:
                 # Different models and/or unknowns present -> hard collision group
-                models_str = ",".join(
-                    sorted([m if m is not None else "UNKNOWN" for m in models])
-                )
-                logger.debug(
-                    f"Hard collision group: fingerprint {fp} on {num_devices_in_group} devices across models [{models_str}]."
+                _logger_lazy.debug(
+                    "{}",
+                    lambda: f"Hard collision group: fingerprint {fp} on {num_devices_in_group} devices across models [{_format_models(device_models, dev_ids)}].",
                 )
                 hard_collision_count += collision_magnitude
 
-        # Hard fail guardrail
-        if hard_collision_count > hard_collision_limit * 2:
-            logger.info(
-                f"Hard collision count {hard_collision_count} exceeds threshold limit {hard_collision_limit * 2}, assigning score 0."
-            )
-            return 0.0
-
-        # Scoring function
-        def calculate_score(count: int, limit: int, exponent: float = 1.0) -> float:
-            if count > limit:
-                return 0.0
-            return 1.0 - (count / limit) ** exponent
+                # Hard fail guardrail
+                if hard_collision_count > hard_collision_fail_limit:
+                    logger.info(
+                        f"Hard collision count {hard_collision_count} exceeds threshold limit {hard_collision_fail_limit}, assigning score 0."
+                    )
+                    return 0.0
 
-        fragmentation_score = calculate_score(fragmented_count, max_allowed_fragmented)
-        soft_collision_score = calculate_score(
-            soft_collision_count, soft_collision_limit
+        # Scoring: 1 - (count / limit) ^ exponent, which reaches 0 once count hits its limit
+        fragmentation_score = 1.0 - min(fragmented_count / max_allowed_fragmented, 1.0)
+        soft_collision_score = 1.0 - min(
+            soft_collision_count / soft_collision_limit, 1.0
         )
-        hard_collision_score = calculate_score(
-            hard_collision_count, hard_collision_limit, 2.0
+        hard_collision_score = (
+            1.0 - min(hard_collision_count / hard_collision_limit, 1.0) ** 2
         )
 
         # Total score
@@ -2,12 +2,12 @@
 
 import os
 import pathlib
+import functools
 from typing import Optional, Annotated
 
 from pydantic import BaseModel, Field, field_validator
 from pydantic.types import StringConstraints
 
-from api.core.constants import ALPHANUM_REGEX
 from api.logger import logger
 from api.core import utils
 
@@ -16,15 +16,21 @@ _app_dir = pathlib.Path(__file__).parent.parent.parent.parent.resolve()
 _dfp_template_dir = _app_dir / "templates" / "js"
 
 _dfp_js_path = str(_dfp_template_dir / "fingerprinter.js")
-_dfp_js_content = ""
 
-try:
-    if os.path.exists(_dfp_js_path):
-        with open(_dfp_js_path, "r") as _dfp_js_file:
-            _dfp_js_content = _dfp_js_file.read()
 
-except Exception:
-    logger.exception(f"Failed to read fingerprinter.js file!")
+@functools.cache
+def _get_dfp_js() -> str:
+    """Read the system-provided fingerprinter.js once and share the same string afterwards."""
+
+    _dfp_js_content = ""
+    try:
+        if os.path.exists(_dfp_js_path):
+            _dfp_js_content = pathlib.Path(_dfp_js_path).read_text()
+
+    except Exception:
+        logger.exception(f"Failed to read fingerprinter.js file!")
+
+    return _dfp_js_content
 
 
 class MinerInput(BaseModel):
@@ -35,7 +41,6 @@ class MinerInput(BaseModel):
                 strip_whitespace=True,
                 min_length=4,
                 max_length=64,
-                pattern=ALPHANUM_REGEX,
             ),
         ]
     ] = Field(
@@ -45,14 +50,26 @@ class MinerInput(BaseModel):
         examples=["a1b2c3d4e5f6g7h8"],
     )
 
+    @field_validator("random_val", mode="after")
+    @classmethod
+    def _check_random_val(cls, val: Optional[str]) -> Optional[str]:
+        # Same as `ALPHANUM_REGEX` pattern, without the regex engine overhead:
+        if (val is not None) and not (val.isascii() and val.isalnum()):
+            raise ValueError(
+                "`random_val` value is invalid, must contain only alphanumeric characters!"
+            )
+        return val
+
 
 class MinerOutput(BaseModel):
     fingerprinter_js: str = Field(
-        default=_dfp_js_content,
+        default_factory=_get_dfp_js,
         title="fingerprinter.js",
         min_length=2,
         description="System-provided fingerprinter.js script for fingerprint detection.",
-        examples=[_dfp_js_content],
+        examples=[
+            "function collectFingerprint() { return { userAgent: navigator.userAgent }; }"
+        ],
     )
 
     @field_validator("fingerprinter_js", mode="after")
@@ -2,12 +2,15 @@
 
 import os
 import time
-
-from pydantic import validate_call
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from rt_comparer import RTComparer
 
-from api.core.configs.challenge import DeviceStateEnum
+from api.core import utils
+from api.core.configs.challenge import DevicePM, DeviceStateEnum
 from api.core.services import utils as utils_services
 from api.config import config
 from api.helpers.tailscale import Tailscale
@@ -33,115 +36,172 @@ def get_task() -> MinerInput:
     return MinerInput()
 
 
-@validate_call
+_ESLINT_CACHE_MAXSIZE = 1024
+_eslint_cache: "OrderedDict[str, tuple[bool, dict, str]]" = OrderedDict()
+_eslint_cache_lock = threading.Lock()
+
+
 def check_eslint(request_id: str, fp_js: str) -> tuple[bool, dict]:
 
+    # ESLint result only depends on the content, so cache it by content hash:
+    _fp_js_bytes = fp_js.encode()
+    _fp_js_hash = hashlib.blake2b(_fp_js_bytes, digest_size=16).hexdigest()
+    with _eslint_cache_lock:
+        if _fp_js_hash in _eslint_cache:
+            _eslint_cache.move_to_end(_fp_js_hash)
+            _is_passed, _report, _ = _eslint_cache[_fp_js_hash]
+            logger.info(
+                f"[{request_id}] - Using cached ESLint result for fingerprinter.js with '{_fp_js_hash}' hash."
+            )
+            return _is_passed, dict(_report)
+
+    # Content-addressed file name, so the same content is written only once:
+    _fp_js_stem, _fp_js_ext = os.path.splitext(config.challenge.fp_js_fname)
     _fp_js_path = os.path.join(
-        config.api.paths.uploads_dir, config.challenge.fp_js_fname
+        config.api.paths.uploads_dir, f"{_fp_js_stem}.{_fp_js_hash}{_fp_js_ext}"
     )
 
-    ch_utils.save_fp_js(request_id=request_id, content=fp_js, file_path=_fp_js_path)
+    if (not os.path.isfile(_fp_js_path)) or (
+        os.path.getsize(_fp_js_path) != len(_fp_js_bytes)
+    ):
+        ch_utils.save_fp_js(request_id=request_id, content=fp_js, file_path=_fp_js_path)
+
     _is_passed, _report = ch_utils.run_eslint(
         request_id=request_id, file_path=_fp_js_path
     )
 
-    return _is_passed, _report
-
+    with _eslint_cache_lock:
+        _eslint_cache[_fp_js_hash] = (_is_passed, _report, _fp_js_path)
+        if _ESLINT_CACHE_MAXSIZE < len(_eslint_cache):
+            _, (_, _, _evicted_path) = _eslint_cache.popitem(last=False)
+            utils.remove_file(_evicted_path)
 
-@validate_call
-def score(request_id: str, miner_output: MinerOutput) -> float:
+    return _is_passed, dict(_report)
 
-    global dfp_manager
-    _score = 0.0
 
-    _is_passed, _ = check_eslint(
-        request_id=request_id, fp_js=miner_output.fingerprinter_js
-    )
+def _run_target_device(
+    request_id: str,
+    order_id: int,
+    target_device: DevicePM,
+    device_lock: threading.Lock,
+) -> None:
+    """Execute the fingerprinting input URL on a target device and wait for its fingerprint.
 
-    if not _is_passed:
-        logger.warning(
-            f"[{request_id}] - Miner submission could not pass ESLint check!"
-        )
-        return _score
-
-    dfp_manager = DFPManager(fp_js=miner_output.fingerprinter_js)
-    dfp_manager.send_fp_js(
-        request_id=request_id,
-        base_url=config.challenge.proxy_inter_base_url,
-        api_key=config.challenge.api_key,
-    )
-    utils_services.check_health(request_id=request_id)
-    dfp_manager.generate_targets(
-        devices=config.challenge.devices,
-        n_repeat=config.challenge.n_repeat,
-        random_seed=config.challenge.random_seed,
-    )
+    Args:
+        request_id    (str           , required): Request ID for logging.
+        order_id      (int           , required): Index of the target device in the shuffled target list.
+        target_device (DevicePM      , required): Target device to run.
+        device_lock   (threading.Lock, required): Lock of the physical device, only one run per device at a time.
+    """
 
-    for _i, _target_device in enumerate(dfp_manager.target_devices):
+    with device_lock:
         if config.challenge.change_ts_ip:
             tailscale.change_device_ip(
-                device_id=_target_device.ts_node_id, ip=config.challenge.ts_static_ip
+                device_id=target_device.ts_node_id, ip=config.challenge.ts_static_ip
             )
             time.sleep(1)
 
         _web_endpoint = "/_web"
         _web_base_url = str(config.challenge.proxy_exter_base_url).rstrip("/")
-        _web_url = f"{_web_base_url}{_web_endpoint}?order_id={_i}"
+        _web_url = f"{_web_base_url}{_web_endpoint}?order_id={order_id}"
         logger.info(
-            f"[{request_id}] - Executing input '{_web_url}' URL for device with {{'order_id': {_i}, 'id': {_target_device.id}}} ..."
+            f"[{request_id}] - Executing input '{_web_url}' URL for device with {{'order_id': {order_id}, 'id': {target_device.id}}} ..."
         )
-        _target_device.state = DeviceStateEnum.RUNNING
+        target_device.state = DeviceStateEnum.RUNNING
         success = pushcut.execute(
             shortcut=config.challenge.pushcut_shortcut,
             input_url=_web_url,
             timeout=config.challenge.pushcut_timeout,
-            server_id=_target_device.pushcut_server_id,
-            api_key=_target_device.pushcut_api_key,
+            server_id=target_device.pushcut_server_id,
+            api_key=target_device.pushcut_api_key,
             raise_on_error=False,  # Don't raise exception, just return False
         )
 
         if not success:
-            _target_device.state = DeviceStateEnum.ERROR
+            target_device.state = DeviceStateEnum.ERROR
             logger.error(
-                f"[{request_id}] - Could not execute pushcut for device with {{'order_id': {_i}, 'id': {_target_device.id}}} (server unavailable or request failed)"
+                f"[{request_id}] - Could not execute pushcut for device with {{'order_id': {order_id}, 'id': {target_device.id}}} (server unavailable or request failed)"
             )
             logger.debug(
-                f"[{request_id}] - Device {{'order_id': {_i}, 'id': {_target_device.id}}} marked as ERROR and will be excluded from scoring. No request sent to external proxy."
+                f"[{request_id}] - Device {{'order_id': {order_id}, 'id': {target_device.id}}} marked as ERROR and will be excluded from scoring. No request sent to external proxy."
             )
-            continue
+            return
 
         logger.info(
-            f"[{request_id}] - Successfully executed input '{_web_url}' URL for device with {{'order_id': {_i}, 'id': {_target_device.id}}}."
+            f"[{request_id}] - Successfully executed input '{_web_url}' URL for device with {{'order_id': {order_id}, 'id': {target_device.id}}}."
         )
 
-        _t = 0
-        while True:
-            if _target_device.state == DeviceStateEnum.COMPLETED:
-                logger.success(
-                    f"[{request_id}] - Successfully completed fingerprinting for device with {{'order_id': {_i}, 'id': {_target_device.id}, 'fingerprint': '{_target_device.fingerprint}'}}."
-                )
-                break
-
-            if config.challenge.fp_timeout <= _t:
-                logger.warning(
-                    f"[{request_id}] - Device with {{'order_id': {_i}, 'id': {_target_device.id}}} could not completed fingerprinting within {config.challenge.fp_timeout} seconds!"
-                )
-                _target_device.state = DeviceStateEnum.TIMEOUT
-                break
-
-            _t = _t + 1
-            time.sleep(1)
+        if target_device.wait_completed(timeout=config.challenge.fp_timeout):
+            logger.success(
+                f"[{request_id}] - Successfully completed fingerprinting for device with {{'order_id': {order_id}, 'id': {target_device.id}, 'fingerprint': '{target_device.fingerprint}'}}."
+            )
+        else:
+            logger.warning(
+                f"[{request_id}] - Device with {{'order_id': {order_id}, 'id': {target_device.id}}} could not completed fingerprinting within {config.challenge.fp_timeout} seconds!"
+            )
+            target_device.state = DeviceStateEnum.TIMEOUT
 
         if config.challenge.change_ts_ip:
             tailscale.change_device_ip(
-                device_id=_target_device.ts_node_id, ip=_target_device.ts_ip
+                device_id=target_device.ts_node_id, ip=target_device.ts_ip
+            )
+
+    return
+
+
+def score(request_id: str, miner_output: MinerOutput) -> float:
+
+    global dfp_manager
+    _score = 0.0
+
+    _is_passed, _ = check_eslint(
+        request_id=request_id, fp_js=miner_output.fingerprinter_js
+    )
+
+    if not _is_passed:
+        logger.warning(
+            f"[{request_id}] - Miner submission could not pass ESLint check!"
+        )
+        return _score
+
+    dfp_manager = DFPManager(fp_js=miner_output.fingerprinter_js)
+    dfp_manager.send_fp_js(
+        request_id=request_id,
+        base_url=config.challenge.proxy_inter_base_url,
+        api_key=config.challenge.api_key,
+    )
+    utils_services.check_health(request_id=request_id)
+    dfp_manager.generate_targets(
+        devices=config.challenge.devices,
+        n_repeat=config.challenge.n_repeat,
+        random_seed=config.challenge.random_seed,
+    )
+
+    _target_devices = dfp_manager.target_devices
+    _device_locks = {_device.id: threading.Lock() for _device in _target_devices}
+    _max_workers = 1
+    if not config.challenge.change_ts_ip:
+        # All devices share the same static IP when changing Tailscale IPs, so they must run one by one:
+        _max_workers = min(32, len(_device_locks))
+
+    with ThreadPoolExecutor(max_workers=_max_workers) as _executor:
+        _futures = [
+            _executor.submit(
+                _run_target_device,
+                request_id=request_id,
+                order_id=_i,
+                target_device=_target_device,
+                device_lock=_device_locks[_target_device.id],
             )
+            for _i, _target_device in enumerate(_target_devices)
+        ]
+        for _future in as_completed(_futures):
+            _future.result()
 
     _score = dfp_manager.score()
     return _score
 
 
-@validate_call
 def set_fingerprint(order_id: int, fingerprint: str) -> None:
 
     global dfp_manager
@@ -161,7 +221,7 @@ def set_fingerprint(order_id: int, fingerprint: str) -> None:
         )
 
     _target_device.fingerprint = fingerprint.strip()
-    _target_device.state = DeviceStateEnum.COMPLETED
+    _target_device.set_completed()
 
     return
 
@@ -2,12 +2,14 @@
 
 import os
 import json
+import queue
+import atexit
 import pathlib
+import tempfile
+import threading
 import subprocess
+from typing import Optional
 from json import JSONDecodeError
-from subprocess import CalledProcessError
-
-from pydantic import validate_call
 
 from api.core import utils
 from api.logger import logger
@@ -15,9 +17,9 @@ from api.logger import logger
 
 _APP_DIR = pathlib.Path(__file__).parent.parent.parent.parent.resolve()
 _ESLINT_CONFIG_PATH = os.path.join(_APP_DIR, "eslint.config.mjs")
+_ESLINT_DAEMON_FNAME = "eslint-daemon.mjs"
 
 
-@validate_call
 def save_fp_js(request_id: str, content: str, file_path: str) -> None:
     """Save the fingerprinter.js content to a specified file path.
 
@@ -37,10 +39,19 @@ def save_fp_js(request_id: str, content: str, file_path: str) -> None:
     try:
         _parent_dir = os.path.dirname(file_path)
         utils.create_dir(_parent_dir)
-        utils.remove_file(file_path)
 
-        with open(file_path, "w") as _file:
-            _file.write(content)
+        # Write to a sibling temp file and atomically rename it, so the file is never missing or half-written:
+        _tmp_fd, _tmp_path = tempfile.mkstemp(
+            dir=_parent_dir, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(_tmp_fd, "wb") as _file:
+                _file.write(content.encode("utf-8"))
+
+            os.replace(_tmp_path, file_path)
+        except Exception:
+            utils.remove_file(_tmp_path)
+            raise
 
         logger.info(
             f"[{request_id}] - Successfully saved '{file_path}' fingerprinter.js file."
@@ -54,7 +65,121 @@ def save_fp_js(request_id: str, content: str, file_path: str) -> None:
     return
 
 
-@validate_call
+class _ESLintDaemon:
+    """Persistent Node.js process that keeps ESLint loaded in memory between lint requests.
+
+    Spawning `npx eslint` per file pays Node.js startup and ESLint module resolution every time, this daemon pays it
+    only once and then lints files over a line-delimited JSON protocol on stdin/stdout (see `eslint-daemon.mjs`).
+    """
+
+    def __init__(self, script_path: str):
+        self.script_path = script_path
+        self._process: Optional[subprocess.Popen] = None
+        self._stdout_queue: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        self._process = subprocess.Popen(
+            ["node", self.script_path],
+            cwd=os.path.dirname(self.script_path),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._stdout_queue = queue.Queue()
+        threading.Thread(
+            target=self._read_stdout,
+            args=(self._process.stdout, self._stdout_queue),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _read_stdout(stdout, stdout_queue: "queue.Queue[str]") -> None:
+        for _line in stdout:
+            stdout_queue.put(_line)
+
+        # EOF, process exited:
+        stdout_queue.put("")
+
+    def close(self) -> None:
+        if self._process and (self._process.poll() is None):
+            self._process.kill()
+            self._process.wait()
+
+        self._process = None
+
+    def lint(self, file_path: str, config_path: str, timeout: int) -> list[dict]:
+        """Lint a file with the resident ESLint instance.
+
+        Args:
+            file_path   (str, required): Path of the file to lint.
+            config_path (str, required): Path of the ESLint config file.
+            timeout     (int, required): Timeout in seconds to wait for the lint result.
+
+        Raises:
+            subprocess.TimeoutExpired: If ESLint did not respond within the timeout, the daemon is restarted on next call.
+            RuntimeError             : If the daemon exited unexpectedly or ESLint failed to lint the file.
+
+        Returns:
+            list[dict]: ESLint results, same as `eslint -f json` output.
+        """
+
+        _request = {
+            "file_path": file_path,
+            "config_path": config_path,
+            "cwd": os.path.dirname(file_path),
+        }
+
+        with self._lock:
+            if (not self._process) or (self._process.poll() is not None):
+                self._start()
+
+            try:
+                self._process.stdin.write(json.dumps(_request) + "\n")
+                self._process.stdin.flush()
+                _line = self._stdout_queue.get(timeout=timeout)
+            except queue.Empty:
+                self.close()
+                raise subprocess.TimeoutExpired(cmd=self.script_path, timeout=timeout)
+            except BrokenPipeError:
+                self.close()
+                raise RuntimeError("ESLint daemon process exited unexpectedly!")
+
+            if not _line:
+                self.close()
+                raise RuntimeError("ESLint daemon process exited unexpectedly!")
+
+        _response: dict = json.loads(_line)
+        if "error" in _response:
+            raise RuntimeError(
+                f"ESLint daemon failed to lint file: {_response['error']}"
+            )
+
+        return _response.get("results", [])
+
+
+_eslint_daemons: dict[str, _ESLintDaemon] = {}
+_eslint_daemons_lock = threading.Lock()
+
+
+def _get_eslint_daemon(prefix_dir: str) -> _ESLintDaemon:
+    with _eslint_daemons_lock:
+        if prefix_dir not in _eslint_daemons:
+            _eslint_daemons[prefix_dir] = _ESLintDaemon(
+                script_path=os.path.join(prefix_dir, _ESLINT_DAEMON_FNAME)
+            )
+
+        return _eslint_daemons[prefix_dir]
+
+
+@atexit.register
+def _close_eslint_daemons() -> None:
+    for _eslint_daemon in _eslint_daemons.values():
+        _eslint_daemon.close()
+
+
 def run_eslint(
     request_id: str,
     file_path: str,
@@ -67,55 +192,28 @@ def run_eslint(
     _report = {}
 
     logger.info(f"[{request_id}] - Running ESLint to check '{file_path}' file...")
-    _report_stdout = ""
     try:
-        _parent_dir = os.path.dirname(file_path)
-        # fmt: off
-        _cmd = ["npx", "--prefix", prefix_dir, "eslint", "-c", config_path, "-f", "json", file_path]
-        # fmt: on
-        _result = subprocess.run(
-            _cmd,
-            cwd=_parent_dir,
-            capture_output=True,
-            check=True,
-            text=True,
-            timeout=timeout,
+        _results = _get_eslint_daemon(prefix_dir=prefix_dir).lint(
+            file_path=file_path, config_path=config_path, timeout=timeout
         )
+        if _results:
+            _report = _results[0]
 
-        if _result.stdout:
-            _report_stdout = _result.stdout
-
-        _is_passed = True
+        _is_passed = all(_result.get("errorCount", 0) == 0 for _result in _results)
         logger.success(
             f"[{request_id}] - Successfully ran ESLint on '{file_path}' file."
         )
-    except CalledProcessError as err:
-        if err.stderr:
-            logger.error(
-                f"[{request_id}] - Failed to run ESLint on '{file_path}' file!"
-            )
-            raise
-
-        if err.stdout:
-            _report_stdout = err.stdout
-
     except FileNotFoundError:
-        logger.error(f"[{request_id}] - Not found 'npx' command on this system!")
+        logger.error(f"[{request_id}] - Not found 'node' command on this system!")
         raise
-    except Exception:
+    except JSONDecodeError:
         logger.error(
-            f"[{request_id}] - Unexpected error occurred while running ESLint on '{file_path}' file!"
+            f"[{request_id}] - Failed to parse ESLint output as JSON for '{file_path}' file!"
         )
         raise
-
-    if _report_stdout:
-        try:
-            _report = json.loads(_report_stdout)[0]
-        except JSONDecodeError:
-            logger.error(
-                f"[{request_id}] - Failed to parse ESLint output as JSON for '{file_path}' file!"
-            )
-            raise
+    except Exception:
+        logger.error(f"[{request_id}] - Failed to run ESLint on '{file_path}' file!")
+        raise
 
     _report.pop("source", None)
     _report.pop("filePath", None)
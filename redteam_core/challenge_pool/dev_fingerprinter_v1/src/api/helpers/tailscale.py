@@ -1,34 +1,240 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+import bisect
+import ipaddress
 import logging
 from typing import Optional
+from ipaddress import IPv4Address, IPv6Address
 
+import aiohttp
+import orjson
 import requests
-from pydantic import validate_call, SecretStr, IPvAnyAddress, IPvAnyNetwork
-
-from api.core import utils
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import validate_call, TypeAdapter, SecretStr, IPvAnyAddress
 
 
 logger = logging.getLogger(__name__)
 
+_IP_ADAPTER = TypeAdapter(IPvAnyAddress)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+_TS_API_BASE_URL = "https://api.tailscale.com/api/v2"
+_TS_CIDR = ipaddress.ip_network("100.64.0.0/10")
+_TS_RESERVED_IP_RANGES = [
+    ipaddress.ip_network("100.100.0.0/24"),
+    ipaddress.ip_network("100.100.100.0/24"),
+    ipaddress.ip_network("100.115.92.0/23"),
+]
+# Integer (first, last) address bounds, so IP checks are plain integer comparisons:
+_TS_CIDR_BOUNDS = (int(_TS_CIDR.network_address), int(_TS_CIDR.broadcast_address))
+# Sorted and merged (non-overlapping), so a lookup is a binary search over range starts:
+_TS_RESERVED_BOUNDS = [
+    (int(_range.network_address), int(_range.broadcast_address))
+    for _range in ipaddress.collapse_addresses(_TS_RESERVED_IP_RANGES)
+]
+_TS_RESERVED_FIRSTS = [_first for _first, _ in _TS_RESERVED_BOUNDS]
+
+
+def _build_url(endpoint: str) -> str:
+    return f"{_TS_API_BASE_URL}{endpoint}"
+
+
+def _fields_params(all_fields: bool) -> Optional[dict]:
+    return {"fields": "all"} if all_fields else None
+
+
+def _resolve_tailnet(default: Optional[str], tailnet: Optional[str]) -> str:
+    """Resolve the tailnet name from the argument, falling back to the attribute.
+
+    Raises:
+        ValueError: If neither `tailnet` argument nor attribute is set.
+    """
+
+    _tailnet = default
+    if tailnet:
+        _tailnet = tailnet.strip()
+
+    if not _tailnet:
+        raise ValueError("`tailnet` attribute/argument is empty!")
+
+    return _tailnet
+
+
+def _filter_devices(result: dict, tag: Optional[str] = None) -> list[dict]:
+    """Get devices from a Tailscale API devices response, optionally filtered by tag.
 
-class Tailscale:
+    Raises:
+        KeyError  : If the response is not a JSON object.
+        ValueError: If the response has no devices.
+    """
 
-    _TS_API_BASE_URL = "https://api.tailscale.com/api/v2"
-    _TS_CIDR = IPvAnyNetwork("100.64.0.0/10")
-    _TS_RESERVED_IP_RANGES = [
-        IPvAnyNetwork("100.100.0.0/24"),
-        IPvAnyNetwork("100.100.100.0/24"),
-        IPvAnyNetwork("100.115.92.0/23"),
-    ]
+    if not isinstance(result, dict):
+        raise KeyError("Invalid response format from Tailscale API!")
+
+    _all_devices: list[dict] = result.get("devices", [])
+    if not _all_devices:
+        raise ValueError(f"No devices found from Tailscale API!")
+
+    if not tag:
+        return _all_devices
+
+    return [_device for _device in _all_devices if tag in (_device.get("tags") or ())]
+
+
+def _check_ip(ip: IPvAnyAddress | str) -> IPvAnyAddress:
+    """Check the IP address is assignable to a Tailscale device.
+
+    Args:
+        ip (IPvAnyAddress | str, required): IP address to check, parsed only if it is not an IP address object yet.
+
+    Raises:
+        ValueError: If `ip` argument value is not within the Tailscale network range, or within reserved IP ranges.
+
+    Returns:
+        IPvAnyAddress: Checked IP address.
+    """
+
+    if not isinstance(ip, (IPv4Address, IPv6Address)):
+        ip = _IP_ADAPTER.validate_python(ip)
+
+    _ip_int = int(ip)
+    _cidr_first, _cidr_last = _TS_CIDR_BOUNDS
+    if (ip.version != 4) or not (_cidr_first <= _ip_int <= _cidr_last):
+        raise ValueError(
+            f"`ip` argument value '{ip}' is invalid, must be within the Tailscale network range: '{_TS_CIDR}'!"
+        )
+
+    _i = bisect.bisect_right(_TS_RESERVED_FIRSTS, _ip_int) - 1
+    if (0 <= _i) and (_ip_int <= _TS_RESERVED_BOUNDS[_i][1]):
+        raise ValueError(
+            f"`ip` argument value '{ip}' is invalid, must not be within the Tailscale reserved IP ranges: {_TS_RESERVED_IP_RANGES}!"
+        )
+
+    return ip
+
+
+class _TailscaleAuth:
+    """Validated `api_token` and `tailnet` attributes, shared by the sync and async clients."""
+
+    ### ATTRIBUTES ###
+    ## api_token ##
+    @property
+    def api_token(self) -> SecretStr:
+        try:
+            return self.__api_token
+        except AttributeError:
+            raise AttributeError("`api_token` attribute is not set!")
+
+    @api_token.setter
+    def api_token(self, api_token: SecretStr | str):
+        if not isinstance(api_token, (SecretStr, str)):
+            raise TypeError(
+                f"`api_token` attribute type {type(api_token)} is invalid, must be a <SecretStr> or <str>!"
+            )
+
+        if isinstance(api_token, SecretStr):
+            api_token = str(api_token.get_secret_value())
+
+        api_token = api_token.strip()
+        if not api_token:
+            raise ValueError("`api_token` attribute value is empty!")
+
+        if not api_token.startswith("tskey-api-"):
+            raise ValueError(
+                f"`api_token` attribute value is invalid, must start with 'tskey-api-' prefix!"
+            )
+
+        self.__api_token = SecretStr(api_token)
+        # Build auth headers once, instead of unwrapping the secret on every request:
+        self.__auth_headers = {
+            "Accept": "application/json",
+            "Authorization": f"Bearer {api_token}",
+        }
+        _session = getattr(self, "_session", None)
+        if isinstance(_session, requests.Session):
+            _session.headers.update(self.__auth_headers)
+
+    ## api_token ##
+
+    ## _auth_headers ##
+    @property
+    def _auth_headers(self) -> dict[str, str]:
+        try:
+            return self.__auth_headers
+        except AttributeError:
+            raise AttributeError("`api_token` attribute is not set!")
+
+    ## _auth_headers ##
+
+    ## tailnet ##
+    @property
+    def tailnet(self) -> str | None:
+        try:
+            return self.__tailnet
+        except AttributeError:
+            return None
+
+    @tailnet.setter
+    def tailnet(self, tailnet: str):
+        if not isinstance(tailnet, str):
+            raise TypeError(
+                f"`tailnet` attribute type {type(tailnet)} is invalid, must be a <str>!"
+            )
+
+        tailnet = tailnet.strip()
+        if not tailnet:
+            raise ValueError("`tailnet` attribute value is empty!")
+
+        if (len(tailnet) < 2) or (128 < len(tailnet)):
+            raise ValueError(
+                f"`tailnet` attribute value length '{len(tailnet)}' is invalid, must be between 2 and 128 characters!"
+            )
+
+        self.__tailnet = tailnet
+
+    ## tailnet ##
+    ### ATTRIBUTES ###
+
+
+class Tailscale(_TailscaleAuth):
+
+    _TS_API_TIMEOUT = (3.05, 30)
 
     @validate_call
     def __init__(self, api_token: SecretStr, tailnet: Optional[str] = None):
+        # Shared session, so keep-alive connections are reused across API calls:
+        self._session = requests.Session()
+        _adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", _adapter)
+
+        # Also sets default auth headers on the session:
         self.api_token = api_token
         if tailnet:
             self.tailnet = tailnet
 
-    @validate_call
+    def __enter__(self) -> "Tailscale":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+
+        self._session.close()
+
     def get_devices(
         self,
         tag: Optional[str] = None,
@@ -53,40 +259,16 @@ class Tailscale:
         """
 
         _devices = []
-        _tailnet = self.tailnet
-        if tailnet:
-            _tailnet = tailnet.strip()
-
-        if not _tailnet:
-            raise ValueError("`tailnet` attribute/argument is empty!")
+        _tailnet = _resolve_tailnet(default=self.tailnet, tailnet=tailnet)
 
         logger.debug(f"Getting devices from '{_tailnet}' tailnet...")
         try:
-            _endpoint = f"/tailnet/{_tailnet}/devices"
-            _query = "?fields=all" if all_fields else ""
-            _url = f"{Tailscale._TS_API_BASE_URL}{_endpoint}{_query}"
-            _headers = {
-                "Accept": "application/json",
-                "Authorization": f"Bearer {self.api_token.get_secret_value()}",
-            }
-            _response = requests.get(_url, headers=_headers)
-            _response.raise_for_status()
-
-            _result = _response.json()
-            if not isinstance(_result, dict):
-                raise KeyError("Invalid response format from Tailscale API!")
-
-            _all_devices: list[dict] = _result.get("devices", [])
-            if not _all_devices:
-                raise ValueError(f"No devices found from Tailscale API!")
-
-            if tag:
-                for _device in _all_devices:
-                    _tags = _device.get("tags", [])
-                    if tag in _tags:
-                        _devices.append(_device)
-            else:
-                _devices = _all_devices
+            _result = self._request(
+                "GET",
+                f"/tailnet/{_tailnet}/devices",
+                params=_fields_params(all_fields),
+            )
+            _devices = _filter_devices(result=_result, tag=tag)
 
             logger.debug(
                 f"Successfully retrieved {len(_devices)} device(s) from '{_tailnet}' tailnet."
@@ -97,7 +279,6 @@ class Tailscale:
 
         return _devices
 
-    @validate_call
     def get_device(self, id: str, all_fields: bool = False) -> dict:
         """Get a specific device by ID from Tailscale API.
 
@@ -121,37 +302,25 @@ class Tailscale:
         _device = {}
         logger.debug(f"Getting device with ID '{id}'...")
         try:
-            _endpoint = f"/device/{id}"
-            _query = "?fields=all" if all_fields else ""
-            _url = f"{Tailscale._TS_API_BASE_URL}{_endpoint}{_query}"
-            _headers = {
-                "Accept": "application/json",
-                "Authorization": f"Bearer {self.api_token.get_secret_value()}",
-            }
-            _response = requests.get(_url, headers=_headers)
-            if _response.status_code == 404:
+            _device = self._request(
+                "GET", f"/device/{id}", params=_fields_params(all_fields)
+            )
+            logger.debug(f"Successfully retrieved device with '{id}' ID.")
+        except Exception as err:
+            if Tailscale._is_not_found(err):
                 logger.error(f"Not found device with '{id}' ID!")
 
-            _response.raise_for_status()
-
-            _device = _response.json()
-            if not isinstance(_device, dict):
-                raise KeyError("Invalid response format from Tailscale API!")
-
-            logger.debug(f"Successfully retrieved device with '{id}' ID.")
-        except Exception:
             logger.error(f"Failed to retrieve device with '{id}' ID!")
             raise
 
         return _device
 
-    @validate_call
-    def change_device_ip(self, device_id: str, ip: IPvAnyAddress) -> None:
+    def change_device_ip(self, device_id: str, ip: IPvAnyAddress | str) -> None:
         """Change the IP address of a specific device in Tailscale.
 
         Args:
-            device_id (str          , required): The ID of the device to change the IP address.
-            ip        (IPvAnyAddress, required): The new IP address to assign to the device.
+            device_id (str                , required): The ID of the device to change the IP address.
+            ip        (IPvAnyAddress | str, required): The new IP address to assign to the device.
 
         Raises:
             ValueError: If `device_id` argument value is empty.
@@ -163,35 +332,21 @@ class Tailscale:
         if not device_id:
             raise ValueError("`device_id` argument value is empty!")
 
-        if not utils.is_ip_in_range(ip=ip, cidr=Tailscale._TS_CIDR):
-            raise ValueError(
-                f"`ip` argument value '{ip}' is invalid, must be within the Tailscale network range: '{Tailscale._TS_CIDR}'!"
-            )
-
-        for _reserved_range in Tailscale._TS_RESERVED_IP_RANGES:
-            if utils.is_ip_in_range(ip=ip, cidr=_reserved_range):
-                raise ValueError(
-                    f"`ip` argument value '{ip}' is invalid, must not be within the Tailscale reserved IP ranges: {Tailscale._TS_RESERVED_IP_RANGES}!"
-                )
+        ip = _check_ip(ip=ip)
 
         logger.debug(f"Changing IP of '{device_id}' device to '{ip}'...")
         try:
-            _endpoint = f"/device/{device_id}/ip"
-            _url = f"{Tailscale._TS_API_BASE_URL}{_endpoint}"
-            _headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Authorization": f"Bearer {self.api_token.get_secret_value()}",
-            }
-            _payload = {"ipv4": str(ip)}
-            _response = requests.post(_url, headers=_headers, json=_payload)
-            if _response.status_code == 404:
-                logger.error(f"Not found device with '{device_id}' ID!")
-
-            _response.raise_for_status()
-
+            self._request(
+                "POST",
+                f"/device/{device_id}/ip",
+                payload={"ipv4": str(ip)},
+                parse_json=False,
+            )
             logger.debug(f"Successfully changed IP of '{device_id}' device to '{ip}'.")
         except Exception as err:
+            if Tailscale._is_not_found(err):
+                logger.error(f"Not found device with '{device_id}' ID!")
+
             if isinstance(err, requests.RequestException):
                 _message = ""
                 if hasattr(err, "response") and (err.response is not None):
@@ -209,68 +364,242 @@ class Tailscale:
 
         return
 
-    ### ATTRIBUTES ###
-    ## api_token ##
-    @property
-    def api_token(self) -> SecretStr:
-        try:
-            return self.__api_token
-        except AttributeError:
-            raise AttributeError("`api_token` attribute is not set!")
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        payload: Optional[dict] = None,
+        parse_json: bool = True,
+    ) -> dict | None:
+        """Send a request to Tailscale API through the shared session.
 
-    @api_token.setter
-    def api_token(self, api_token: SecretStr | str):
-        if not isinstance(api_token, (SecretStr, str)):
-            raise TypeError(
-                f"`api_token` attribute type {type(api_token)} is invalid, must be a <SecretStr> or <str>!"
-            )
+        Args:
+            method     (str           , required): HTTP method.
+            endpoint   (str           , required): API endpoint path, appended to the base URL.
+            params     (Optional[dict], optional): Query parameters. Defaults to None.
+            payload    (Optional[dict], optional): JSON body. Defaults to None.
+            parse_json (bool          , optional): If True, parse and return the JSON object response. Defaults to True.
 
-        if isinstance(api_token, SecretStr):
-            api_token = str(api_token.get_secret_value())
+        Raises:
+            requests.HTTPError: If the response status code is not successful.
+            KeyError          : If the response is not a JSON object.
+            Exception         : If there is an error while making the API request.
 
-        api_token = api_token.strip()
-        if not api_token:
-            raise ValueError("`api_token` attribute value is empty!")
+        Returns:
+            dict | None: JSON object response, or None if `parse_json` is False.
+        """
 
-        if not api_token.startswith("tskey-api-"):
-            raise ValueError(
-                f"`api_token` attribute value is invalid, must start with 'tskey-api-' prefix!"
+        _headers, _data = None, None
+        if payload is not None:
+            _headers = _JSON_HEADERS
+            _data = orjson.dumps(payload)
+
+        _response = self._session.request(
+            method,
+            _build_url(endpoint),
+            params=params,
+            headers=_headers,
+            data=_data,
+            timeout=Tailscale._TS_API_TIMEOUT,
+        )
+        _response.raise_for_status()
+
+        if not parse_json:
+            return None
+
+        _result = orjson.loads(_response.content)
+        if not isinstance(_result, dict):
+            raise KeyError("Invalid response format from Tailscale API!")
+
+        return _result
+
+    @staticmethod
+    def _is_not_found(err: Exception) -> bool:
+        return (
+            isinstance(err, requests.HTTPError)
+            and (err.response is not None)
+            and (err.response.status_code == 404)
+        )
+
+
+class AsyncTailscale(_TailscaleAuth):
+    """Asynchronous Tailscale API client, to run many device API calls concurrently over one client session.
+
+    Same API calls and errors as `Tailscale`, but the methods are coroutines and the
+    client is used with 'async with' statement.
+    """
+
+    _MAX_CONNECTIONS = 64
+    _MAX_CONCURRENCY = 16
+    _TIMEOUT = 30
+
+    @validate_call
+    def __init__(self, api_token: SecretStr, tailnet: Optional[str] = None):
+        # Created lazily, because aiohttp session must be created inside a running event loop:
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.api_token = api_token
+        if tailnet:
+            self.tailnet = tailnet
+
+    async def __aenter__(self) -> "AsyncTailscale":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client session."""
+
+        if self._session and (not self._session.closed):
+            await self._session.close()
+
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if (not self._session) or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self._auth_headers,
+                connector=aiohttp.TCPConnector(
+                    limit=AsyncTailscale._MAX_CONNECTIONS, limit_per_host=32
+                ),
+                timeout=aiohttp.ClientTimeout(total=AsyncTailscale._TIMEOUT),
             )
 
-        self.__api_token = SecretStr(api_token)
+        return self._session
 
-    ## api_token ##
+    async def get_devices(
+        self,
+        tag: Optional[str] = None,
+        tailnet: Optional[str] = None,
+        all_fields: bool = False,
+    ) -> list[dict]:
+        """Get devices list from Tailscale API, see `Tailscale.get_devices`."""
 
-    ## tailnet ##
-    @property
-    def tailnet(self) -> str | None:
+        _devices = []
+        _tailnet = _resolve_tailnet(default=self.tailnet, tailnet=tailnet)
+
+        logger.debug(f"Getting devices from '{_tailnet}' tailnet...")
         try:
-            return self.__tailnet
-        except AttributeError:
-            return None
+            async with self._get_session().get(
+                _build_url(f"/tailnet/{_tailnet}/devices"),
+                params=_fields_params(all_fields),
+            ) as _response:
+                _response.raise_for_status()
+                _result = await _response.json(loads=orjson.loads)
 
-    @tailnet.setter
-    def tailnet(self, tailnet: str):
-        if not isinstance(tailnet, str):
-            raise TypeError(
-                f"`tailnet` attribute type {type(tailnet)} is invalid, must be a <str>!"
+            _devices = _filter_devices(result=_result, tag=tag)
+
+            logger.debug(
+                f"Successfully retrieved {len(_devices)} device(s) from '{_tailnet}' tailnet."
             )
+        except Exception:
+            logger.error(f"Failed to retrieve devices from '{_tailnet}' tailnet!")
+            raise
 
-        tailnet = tailnet.strip()
-        if not tailnet:
-            raise ValueError("`tailnet` attribute value is empty!")
+        return _devices
 
-        if (len(tailnet) < 2) or (128 < len(tailnet)):
-            raise ValueError(
-                f"`tailnet` attribute value length '{len(tailnet)}' is invalid, must be between 2 and 128 characters!"
-            )
+    async def get_device(self, id: str, all_fields: bool = False) -> dict:
+        """Get a specific device by ID from Tailscale API, see `Tailscale.get_device`."""
 
-        self.__tailnet = tailnet
+        id = id.strip()
+        if not id:
+            raise ValueError("`id` argument value is empty!")
 
-    ## tailnet ##
-    ### ATTRIBUTES ###
+        _device = {}
+        logger.debug(f"Getting device with ID '{id}'...")
+        try:
+            async with self._get_session().get(
+                _build_url(f"/device/{id}"), params=_fields_params(all_fields)
+            ) as _response:
+                if _response.status == 404:
+                    logger.error(f"Not found device with '{id}' ID!")
+
+                _response.raise_for_status()
+                _device = await _response.json(loads=orjson.loads)
+
+            if not isinstance(_device, dict):
+                raise KeyError("Invalid response format from Tailscale API!")
+
+            logger.debug(f"Successfully retrieved device with '{id}' ID.")
+        except Exception:
+            logger.error(f"Failed to retrieve device with '{id}' ID!")
+            raise
+
+        return _device
+
+    async def change_device_ip(self, device_id: str, ip: IPvAnyAddress | str) -> None:
+        """Change the IP address of a device in Tailscale, see `Tailscale.change_device_ip`."""
+
+        device_id = device_id.strip()
+        if not device_id:
+            raise ValueError("`device_id` argument value is empty!")
+
+        ip = _check_ip(ip=ip)
+
+        logger.debug(f"Changing IP of '{device_id}' device to '{ip}'...")
+        try:
+            async with self._get_session().post(
+                _build_url(f"/device/{device_id}/ip"),
+                headers=_JSON_HEADERS,
+                data=orjson.dumps({"ipv4": str(ip)}),
+            ) as _response:
+                if _response.status == 404:
+                    logger.error(f"Not found device with '{device_id}' ID!")
+
+                if 400 <= _response.status:
+                    _message = await _response.text()
+                    logger.error(
+                        f"Failed to change IP of '{device_id}' device: {_message}!"
+                    )
+
+                _response.raise_for_status()
+
+            logger.debug(f"Successfully changed IP of '{device_id}' device to '{ip}'.")
+        except aiohttp.ClientResponseError:
+            # Already logged with the response body above
+            raise
+        except aiohttp.ClientError as err:
+            logger.error(f"Failed to change IP of '{device_id}' device: {err}!")
+            raise
+        except Exception:
+            logger.error(f"Failed to change device IP using Tailscale API!")
+            raise
+
+        return
+
+    async def change_device_ips(self, pairs: list[tuple[str, IPvAnyAddress]]) -> None:
+        """Change the IP addresses of multiple devices concurrently.
+
+        Args:
+            pairs (list[tuple[str, IPvAnyAddress]], required): List of (device ID, new IP address) pairs.
+
+        Raises:
+            ValueError: If any device ID or IP address is invalid, checked before any API request is sent.
+            Exception : If there is an error while making any of the API requests.
+        """
+
+        for _device_id, _ip in pairs:
+            if not _device_id.strip():
+                raise ValueError("`device_id` value is empty!")
+
+            _check_ip(ip=_ip)
+
+        _semaphore = asyncio.Semaphore(AsyncTailscale._MAX_CONCURRENCY)
+
+        async def _bounded_change(device_id: str, ip: IPvAnyAddress) -> None:
+            async with _semaphore:
+                await self.change_device_ip(device_id=device_id, ip=ip)
+
+        await asyncio.gather(
+            *(_bounded_change(_device_id, _ip) for _device_id, _ip in pairs)
+        )
+        return
 
 
 __all__ = [
     "Tailscale",
+    "AsyncTailscale",
 ]
@@ -0,0 +1,41 @@
+// Long-lived ESLint worker: keeps ESLint loaded in memory and lints files on request.
+//
+// Protocol (one JSON object per line):
+//   stdin : {"file_path": "...", "config_path": "...", "cwd": "..."}
+//   stdout: {"results": [...]} (same as `eslint -f json` output) or {"error": "..."}
+
+import readline from "node:readline";
+import { ESLint } from "eslint";
+
+const eslints = new Map();
+
+const getESLint = (configPath, cwd) => {
+  const key = `${configPath}\u0000${cwd}`;
+  let eslint = eslints.get(key);
+  if (!eslint) {
+    eslint = new ESLint({ overrideConfigFile: configPath, cwd });
+    eslints.set(key, eslint);
+  }
+  return eslint;
+};
+
+const reply = (payload) => {
+  process.stdout.write(`${JSON.stringify(payload)}\n`);
+};
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+rl.on("line", async (line) => {
+  try {
+    const { file_path: filePath, config_path: configPath, cwd } = JSON.parse(line);
+    const eslint = getESLint(configPath, cwd);
+    const results = await eslint.lintFiles([filePath]);
+    reply({ results });
+  } catch (err) {
+    reply({ error: String(err && err.stack ? err.stack : err) });
+  }
+});
+
+rl.on("close", () => {
+  process.exit(0);
+});
@@ -36,6 +36,7 @@ Key Assumptions:
 import copy
 import re
 import subprocess
+import threading
 import time
 from typing import List, Optional, Tuple, Union
 
@@ -46,6 +47,13 @@ import docker.types
 import requests
 
 
+IMAGE_DIGEST_PATTERN = r".+@sha256:[a-fA-F0-9]{64}$"
+DOCKER_CLIENT_MAX_POOL_SIZE = 32
+
+_docker_client: Optional[docker.DockerClient] = None
+_docker_client_lock = threading.Lock()
+
+
 def run_container(
     client: docker.DockerClient,
     image: str,
@@ -79,8 +87,44 @@ def run_container(
 
 
 def create_docker_client() -> docker.DockerClient:
-    """Creates and returns a Docker client instance."""
-    return docker.from_env()
+    """
+    Returns the process-wide Docker client instance, creating it on first use.
+    Controllers, comparers and prefetch threads share its connection pool instead of
+    reconnecting to the daemon on every instantiation.
+
+    Returns:
+        Docker client instance
+    """
+    global _docker_client
+
+    with _docker_client_lock:
+        if _docker_client is None:
+            _docker_client = docker.from_env(max_pool_size=DOCKER_CLIENT_MAX_POOL_SIZE)
+        return _docker_client
+
+
+def pull_image(client: docker.DockerClient, image: str) -> bool:
+    """
+    Pulls a digest-pinned image ahead of time, so a later container run doesn't wait for it.
+    Errors are only logged, the container run will surface them.
+
+    Args:
+        client: Docker client instance
+        image: Docker image name with digest
+
+    Returns:
+        bool: True if the image was pulled
+    """
+    if not image or not re.match(IMAGE_DIGEST_PATTERN, image):
+        return False
+
+    try:
+        client.images.pull(image)
+        bt.logging.info(f"Pre-pulled image: {image}")
+        return True
+    except Exception as e:
+        bt.logging.warning(f"Failed to pre-pull image {image}: {e}")
+        return False
 
 
 def build_challenge_image(
@@ -331,8 +375,7 @@ def is_image_digest_format_valid(image: str) -> bool:
     Returns:
         bool: True if digest is valid
     """
-    digest_pattern = r".+@sha256:[a-fA-F0-9]{64}$"
-    if not re.match(digest_pattern, image):
+    if not re.match(IMAGE_DIGEST_PATTERN, image):
         bt.logging.error(
             f"Invalid image format: {image}. Must include a SHA256 digest."
         )
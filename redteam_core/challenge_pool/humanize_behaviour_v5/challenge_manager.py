@@ -117,20 +117,28 @@ class HBChallengeManager(ChallengeManager):
         n_uids = int(self.metagraph.n)
         scores = np.zeros(n_uids)
 
-        evaluation_timestamp = None
-        # Step 1: Determine latest evaluation timestamp & set initial scores
-        for miner_state in self.miner_states.values():
-            best_commit = miner_state.best_commit
-
-            if (
-                best_commit is None
-                or miner_state.miner_uid >= n_uids
-                or miner_state.miner_hotkey not in self.metagraph.hotkeys
-            ):
-                continue
-
-            # Set initial scores
-            scores[miner_state.miner_uid] = best_commit.score
+        # Step 1: Collect valid miners' best commits as arrays & set initial scores
+        _hotkeys = set(self.metagraph.hotkeys)
+        _best_commits = [
+            (miner_state.miner_uid, miner_state.best_commit)
+            for miner_state in self.miner_states.values()
+            if miner_state.best_commit is not None
+            and miner_state.miner_uid < n_uids
+            and miner_state.miner_hotkey in _hotkeys
+        ]
+        _n_commits = len(_best_commits)
+        uids = np.fromiter(
+            (uid for uid, _ in _best_commits), dtype=int, count=_n_commits
+        )
+        best_scores = np.fromiter(
+            (commit.score for _, commit in _best_commits), dtype=float, count=_n_commits
+        )
+        scored_timestamps = np.fromiter(
+            (commit.scored_timestamp for _, commit in _best_commits),
+            dtype=float,
+            count=_n_commits,
+        )
+        scores[uids] = best_scores
 
         # Step 2: If no valid timestamp found, return unmodified scores
         if scores.sum() == 0:
@@ -139,33 +147,16 @@ class HBChallengeManager(ChallengeManager):
             )
             return self._apply_softmax(scores)
 
-        # Step 3: Apply decay and adjustment
-        for miner_state in self.miner_states.values():
-            best_commit = miner_state.best_commit
-            if (
-                best_commit is None
-                or miner_state.miner_uid >= n_uids
-                or miner_state.miner_hotkey not in self.metagraph.hotkeys
-            ):
-                continue  # Skip invalid miners
-
-            commit_timestamp = best_commit.scored_timestamp
-            evaluation_timestamp = time.time()
-            days_elapsed = (evaluation_timestamp - commit_timestamp) / 86400
-
-            # Apply decay and adjustment
-            decayed_score = self._calculate_decayed_score(
-                commit_timestamp, evaluation_timestamp, best_commit.score
-            )
-            adjusted_score = self._adjusted_score(decayed_score, days_elapsed)
-
-            # Update scores
-            scores[miner_state.miner_uid] = adjusted_score
+        # Step 3: Apply decay and adjustment to all valid miners at once
+        evaluation_timestamp = time.time()
+        days_elapsed = (evaluation_timestamp - scored_timestamps) / 86400
+        decayed_scores = self._calculate_decayed_score(
+            scored_timestamps, evaluation_timestamp, best_scores
+        )
+        scores[uids] = self._adjusted_score(decayed_scores, days_elapsed)
 
         # Step 4: Apply softmax and return final scores
-        normalized_scores = [
-            self._inverse_easePolyOut_exponent(score) for score in scores
-        ]
+        normalized_scores = self._inverse_easePolyOut_exponent(scores)
         final_scores = self._apply_softmax(normalized_scores)
         return final_scores
 
@@ -201,9 +192,9 @@ class HBChallengeManager(ChallengeManager):
         return raw_score * (1 - s)
 
     def _time_factor_saturating(self, t):
-        """Returns e^(-alpha * t) up to t_max, then saturates."""
-        effective_t = min(t, self.t_max)
-        return math.exp(-self.alpha * effective_t)
+        """Returns e^(-alpha * t) up to t_max, then saturates. Works element-wise."""
+        effective_t = np.minimum(t, self.t_max)
+        return np.exp(-self.alpha * effective_t)
 
     def _adjusted_score(self, raw_accuracy, t):
         """Computes the adjusted score considering time factor saturation."""
@@ -212,19 +203,21 @@ class HBChallengeManager(ChallengeManager):
     def _calculate_decayed_score(
         self, submission_timestamp, evaluation_timestamp, initial_score
     ):
-        """Calculate the final score with parabolic decay."""
+        """Calculate the final score with parabolic decay. Works element-wise."""
         days_elapsed = (evaluation_timestamp - submission_timestamp) / 86400
-
-        if days_elapsed <= self.stable_period_days:
-            return initial_score
-        elif days_elapsed <= self.expiration_days:
-            decay_progress = (days_elapsed - self.stable_period_days) / (
-                self.expiration_days - self.stable_period_days
-            )
-            decay_factor = 1 - decay_progress**2
-            return initial_score * decay_factor
-        else:
-            return 0
+        decay_progress = (days_elapsed - self.stable_period_days) / (
+            self.expiration_days - self.stable_period_days
+        )
+        decay_factor = 1 - decay_progress**2
+
+        return np.select(
+            [
+                days_elapsed <= self.stable_period_days,
+                days_elapsed <= self.expiration_days,
+            ],
+            [initial_score, initial_score * decay_factor],
+            default=0.0,
+        )
 
     def _apply_softmax(self, scores):
         """Apply softmax with custom temperature to scores."""
@@ -247,8 +240,11 @@ class HBChallengeManager(ChallengeManager):
 
         return softmax_result
 
-    def _inverse_easePolyOut_exponent(self, y: float, exponent: float = 0.600) -> float:
+    def _inverse_easePolyOut_exponent(
+        self, y: np.ndarray, exponent: float = 0.600
+    ) -> np.ndarray:
         """Inverse of the polynomial ease-out function, y must be in the range [0, 1]."""
-        if y < 0 or y > 1:
+        y = np.asarray(y, dtype=float)
+        if np.any((y < 0) | (y > 1)):
             raise ValueError("y must be in the range [0, 1]")
         return 1 - (1 - y) ** (1 / exponent)
@@ -1,6 +1,9 @@
+import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 import bittensor as bt
+from diskcache import Cache
 
 
 from redteam_core.challenge_pool import docker_utils
@@ -18,6 +21,12 @@ class HBController(Controller):
     _baseline_reference_cache: dict[str, MinerChallengeCommit] = (
         {}
     )  # {docker_hub_id: MinerChallengeCommit}
+    # Persistent copy of the baseline reference cache, so restarts don't re-run baselines.
+    # Keys are digest-pinned docker_hub_ids, so a changed image is always a cache miss.
+    _BASELINE_REFERENCE_DISK_CACHE_DIR = os.path.expanduser(
+        "~/.cache/hb_controller/baseline_refs/"
+    )
+    _baseline_reference_disk_cache: Cache = None
 
     """
     A specialized controller for the 'humanize_behaviour_v3' challenge.
@@ -59,6 +68,10 @@ class HBController(Controller):
         ] = []
 
         for docker_hub_id in self.baseline_reference_comparison_docker_hub_ids:
+            # Fall back to the disk cache, when not in the class cache yet
+            if docker_hub_id not in HBController._baseline_reference_cache:
+                self._load_baseline_reference_from_disk(docker_hub_id)
+
             # Check if this docker_hub_id is already in the class cache
             if docker_hub_id in HBController._baseline_reference_cache:
                 cached_commit = HBController._baseline_reference_cache[docker_hub_id]
@@ -108,9 +121,51 @@ class HBController(Controller):
         remaining_tasks = max(0, num_task - len(challenge_inputs))
         if remaining_tasks > 0:
             challenge_inputs.extend(
-                [self._get_challenge_from_container() for _ in range(remaining_tasks)]
+                self._get_challenges_from_container(remaining_tasks)
             )
 
+        # Miner containers share MINER_DOCKER_PORT and the stateful challenge container,
+        # so they are scored one by one; only the image pulls are overlapped with scoring.
+        prefetch_executor = self._prefetch_images(
+            self.baseline_reference_comparison_commits_to_score + self.miner_commits
+        )
+        try:
+            self._score_commits(challenge_inputs)
+        finally:
+            prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+        # Clean up challenge container
+        docker_utils.remove_container(
+            client=self.docker_client,
+            container_name=self.challenge_name,
+            stop_timeout=10,
+            force=True,
+            remove_volumes=True,
+        )
+        docker_utils.clean_docker_resources(
+            client=self.docker_client,
+            remove_containers=True,
+            remove_images=False,
+        )
+
+    def _prefetch_images(
+        self, commits: list[MinerChallengeCommit], max_workers: int = 2
+    ) -> ThreadPoolExecutor:
+        """Start pulling commit images in the background, in scoring order."""
+        prefetch_client = docker_utils.create_docker_client()
+        prefetch_executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="image-prefetch"
+        )
+        for commit in commits:
+            prefetch_executor.submit(
+                docker_utils.pull_image,
+                client=prefetch_client,
+                image=commit.docker_hub_id,
+            )
+        return prefetch_executor
+
+    def _score_commits(self, challenge_inputs):
+        """Score baseline reference commits and miner commits, one container at a time."""
         for reference_commit in self.baseline_reference_comparison_commits_to_score:
             try:
                 bt.logging.info(
@@ -124,11 +179,6 @@ class HBController(Controller):
                     client=self.docker_client,
                     port=constants.MINER_DOCKER_PORT,
                 )
-                docker_utils.clean_docker_resources(
-                    client=self.docker_client,
-                    remove_containers=True,
-                    remove_images=False,
-                )
 
                 bt.logging.info(
                     f"[CONTROLLER - HBController] Baseline reference scoring logs: {len(reference_commit.scoring_logs)}"
@@ -137,6 +187,7 @@ class HBController(Controller):
                 HBController._baseline_reference_cache[
                     reference_commit.docker_hub_id
                 ] = reference_commit
+                self._save_baseline_reference_to_disk(reference_commit)
 
             except Exception as e:
                 bt.logging.error(
@@ -145,7 +196,7 @@ class HBController(Controller):
                 bt.logging.error(traceback.format_exc())
 
         # Score commits and build comparison logs
-        for miner_commit in self.miner_commits:
+        for i, miner_commit in enumerate(self.miner_commits, start=1):
             uid, hotkey = miner_commit.miner_uid, miner_commit.miner_hotkey
 
             try:
@@ -170,69 +221,124 @@ class HBController(Controller):
                         )
                     )
 
-            # Clean up miner container
+            # Clean up miner container, full cleanup runs only periodically since it lists all containers
             docker_utils.remove_container_by_port(
                 client=self.docker_client,
                 port=constants.MINER_DOCKER_PORT,
             )
-            docker_utils.clean_docker_resources(
-                client=self.docker_client,
-                remove_containers=True,
-                remove_images=False,
-            )
-
-        # Clean up challenge container
-        docker_utils.remove_container(
-            client=self.docker_client,
-            container_name=self.challenge_name,
-            stop_timeout=10,
-            force=True,
-            remove_volumes=True,
-        )
-        docker_utils.clean_docker_resources(
-            client=self.docker_client,
-            remove_containers=True,
-            remove_images=False,
-        )
+            if i % self._CLEANUP_EVERY_N_MINERS == 0:
+                docker_utils.clean_docker_resources(
+                    client=self.docker_client,
+                    remove_containers=True,
+                    remove_images=False,
+                )
 
     def _score_miner_with_new_inputs(
         self, miner_commit: MinerChallengeCommit, challenge_inputs
     ):
         """Run and score miner with new challenge inputs."""
-        for i, miner_input in enumerate(challenge_inputs):
-            # Skip if comparison result is high
-            _higest_comparison_score = miner_commit.get_higest_comparison_score()
-            if (
-                _higest_comparison_score >= self.comparison_min_acceptable_score
-                or _higest_comparison_score == 0.0
-            ):
-                bt.logging.info(
-                    f"[CONTROLLER - HBController] Skipping scoring for miner {miner_commit.miner_hotkey} on task {i} due to high comparison score: {_higest_comparison_score}"
-                )
-                miner_commit.scoring_logs[0].score = 0.0
-                miner_commit.scoring_logs[0].error = (
-                    "[Not Accepted]High comparison score, skipping scoring"
-                )
-                continue
+        # Comparison logs and miner output don't change while scoring the inputs
+        _higest_comparison_score = miner_commit.get_higest_comparison_score()
+        _miner_output = (
+            miner_commit.scoring_logs[0].miner_output
+            if miner_commit.scoring_logs
+            else None
+        )
+        # Skip all tasks if comparison result is high, the decision is the same for every task
+        if challenge_inputs and (
+            _higest_comparison_score >= self.comparison_min_acceptable_score
+            or _higest_comparison_score == 0.0
+        ):
+            bt.logging.info(
+                f"[CONTROLLER - HBController] Skipping scoring for miner {miner_commit.miner_hotkey} on {len(challenge_inputs)} task(s) due to high comparison score: {_higest_comparison_score}"
+            )
+            miner_commit.scoring_logs[0].score = 0.0
+            miner_commit.scoring_logs[0].error = (
+                "[Not Accepted]High comparison score, skipping scoring"
+            )
+            return
 
+        for i, miner_input in enumerate(challenge_inputs):
             score = (
                 self._score_challenge(
                     miner_input=miner_input,
-                    miner_output=miner_commit.scoring_logs[0].miner_output,
+                    miner_output=_miner_output,
                     task_id=i,
                 )
-                if miner_commit.scoring_logs[0].miner_output is not None
+                if self._is_scorable(_miner_output)
                 else 0.0
             )
 
             miner_commit.scoring_logs[0].score = score
 
+    @classmethod
+    def _get_baseline_reference_disk_cache(cls) -> Cache:
+        if cls._baseline_reference_disk_cache is None:
+            os.makedirs(cls._BASELINE_REFERENCE_DISK_CACHE_DIR, exist_ok=True)
+            cls._baseline_reference_disk_cache = Cache(
+                cls._BASELINE_REFERENCE_DISK_CACHE_DIR, eviction_policy="none"
+            )
+        return cls._baseline_reference_disk_cache
+
+    def _get_baseline_reference_disk_cache_key(self, docker_hub_id: str) -> str:
+        """Disk cache key, namespaced per challenge as the cache directory is shared."""
+        return f"{self.challenge_name}:{docker_hub_id}"
+
+    @staticmethod
+    def _has_miner_output(commit: MinerChallengeCommit) -> bool:
+        """Whether the commit has output for at least one input, not only error logs."""
+        return any(log.miner_output is not None for log in commit.scoring_logs)
+
+    def _load_baseline_reference_from_disk(self, docker_hub_id: str):
+        """Load a scored baseline reference commit from the disk cache into the class cache."""
+        try:
+            cached_json = self._get_baseline_reference_disk_cache().get(
+                self._get_baseline_reference_disk_cache_key(docker_hub_id)
+            )
+            if cached_json is None:
+                return
+
+            cached_commit = MinerChallengeCommit.model_validate_json(cached_json)
+            if self._has_miner_output(cached_commit):
+                HBController._baseline_reference_cache[docker_hub_id] = cached_commit
+                bt.logging.info(
+                    f"[CONTROLLER - HBController] Loaded reference commit {docker_hub_id} from disk cache"
+                )
+        except Exception as e:
+            bt.logging.warning(
+                f"[CONTROLLER - HBController] Failed to load reference commit {docker_hub_id} from disk cache: {e}"
+            )
+
+    def _save_baseline_reference_to_disk(self, reference_commit: MinerChallengeCommit):
+        """Persist a scored baseline reference commit, skipping ones without miner output.
+
+        Commits with only error logs (e.g. the container timed out on every input) are
+        not persisted, so they are retried after a restart instead of reused forever.
+        """
+        if not self._has_miner_output(reference_commit):
+            return
+
+        try:
+            self._get_baseline_reference_disk_cache().set(
+                self._get_baseline_reference_disk_cache_key(
+                    reference_commit.docker_hub_id
+                ),
+                reference_commit.model_dump_json(),
+            )
+        except Exception as e:
+            bt.logging.warning(
+                f"[CONTROLLER - HBController] Failed to save reference commit {reference_commit.docker_hub_id} to disk cache: {e}"
+            )
+
     def _get_all_reference_commits(self):
         return self.reference_comparison_commits + list(
             HBController._baseline_reference_cache.values()
         )
 
-    def _exclude_output_keys(self, miner_output: dict, reference_output: dict):
-        miner_output["bot_py"] = None
-        reference_output["bot_py"] = None
-        return
+    def _exclude_output_keys(
+        self, miner_output: dict, reference_output: dict
+    ) -> tuple[dict, dict]:
+        return (
+            {**miner_output, "bot_py": None},
+            {**reference_output, "bot_py": None},
+        )
@@ -1,23 +1,24 @@
 # -*- coding: utf-8 -*-
 
 import os
-import time
-import json
+import queue
+import hashlib
 import pathlib
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Union, Dict, Tuple
 
 import docker
+import orjson
 from pydantic import validate_call
 from fastapi import Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from markupsafe import Markup
 from rt_comparer import RTComparer
 
-try:
-    from modules.rt_hb_score import MetricsProcessor  # type: ignore
-except ImportError:
-    from rt_hb_score import MetricsProcessor  # type: ignore
-
 from api.core.constants import ErrorCodeEnum
 from api.core import utils
 from api.config import config
@@ -29,22 +30,90 @@ from api.logger import logger
 
 
 _src_dir = pathlib.Path(__file__).parent.parent.parent.parent.resolve()
+_templates = Jinja2Templates(directory=(_src_dir / "./templates/html"))
+
+# Config is frozen, so values used on every request are bound once:
+_N_CH_PER_EPOCH: int = config.challenge.n_ch_per_epoch
+_N_RUN_PER_CH: int = config.challenge.n_run_per_ch
+_N_SESSIONS: int = _N_CH_PER_EPOCH * _N_RUN_PER_CH
+_KEY_SIZE: int = config.api.security.asymmetric.key_size
+_CB_ACTIONS_KWARGS: Dict = dict(
+    window_width=config.challenge.window_width,
+    window_height=config.challenge.window_height,
+    n_checkboxes=config.challenge.n_checkboxes,
+    min_distance=config.challenge.cb_min_distance,
+    max_factor=config.challenge.cb_gen_max_factor,
+    checkbox_size=config.challenge.cb_size,
+    exclude_areas=config.challenge.cb_exclude_areas,
+)
+
+
+def _start_process_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Create a process pool and fork its workers right away, from the importing thread"""
+    # Not spawned, since spawned workers re-import `main.py` and would create the app again.
+    # Forked on import, before the background threads below are started:
+    _executor = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("fork")
+    )
+    _executor.submit(int).result()
+    return _executor
+
+
+_keygen_executor = _start_process_executor(
+    max_workers=min(os.cpu_count() or 1, _N_SESSIONS)
+)
+# Metrics evaluation is CPU-heavy, run it in a worker process to not hold the API GIL:
+_metrics_executor = _start_process_executor(max_workers=1)
+
+
+# Public keys for the web page are pre-generated, so `get_web` doesn't block on RSA key generation:
+_web_key_pool: "queue.Queue[Tuple[str, str]]" = queue.Queue(maxsize=32)
+
+
+def _fill_web_key_pool() -> None:
+    """Keep the web key pool filled, runs on a daemon thread"""
+    while True:
+        _web_key_pool.put(
+            asymmetric_helper.gen_key_pair(key_size=_KEY_SIZE, as_str=True)
+        )
+
+
+threading.Thread(target=_fill_web_key_pool, name="web-key-pool", daemon=True).start()
+
+
+def _get_web_key_pair() -> Tuple[str, str]:
+    """Get a pre-generated key pair, or generate one if the pool is not ready in time"""
+    try:
+        return _web_key_pool.get(timeout=5)
+    except queue.Empty:
+        logger.warning("Web key pool is empty, generating key pair synchronously!")
+        return asymmetric_helper.gen_key_pair(key_size=_KEY_SIZE, as_str=True)
 
 
 _TMP_ACTION_LIST: List[Dict[str, Union[int, str, Dict[str, Dict[str, int]]]]] = (
     ch_utils.gen_cb_actions(
         n_challenge=1,
-        window_width=config.challenge.window_width,
-        window_height=config.challenge.window_height,
-        n_checkboxes=config.challenge.n_checkboxes,
-        min_distance=config.challenge.cb_min_distance,
-        max_factor=config.challenge.cb_gen_max_factor,
-        checkbox_size=config.challenge.cb_size,
-        exclude_areas=config.challenge.cb_exclude_areas,
+        **_CB_ACTIONS_KWARGS,
     )[0]
 )
 
 
+def _to_html_json(obj) -> Markup:
+    """Serialize to HTML-safe JSON, same escaping as Jinja2 `tojson` filter"""
+    _json_str = (
+        orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        .decode()
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+        .replace("'", "\\u0027")
+    )
+    return Markup(_json_str)
+
+
+_TMP_ACTION_LIST_JSON: Markup = _to_html_json(_TMP_ACTION_LIST)
+
+
 class TaskManager:
     """
     Task Manager for handling key pairs, action lists, and evaluation metrics
@@ -54,44 +123,69 @@ class TaskManager:
     @validate_call
     def __init__(self, uid: str = None):
         self.uid = uid
+        # Guards task state, bot requests and `score()` run on different worker threads
+        self.lock = threading.RLock()
+        self._score_event = threading.Event()
+        self._next_tasks: Union[Future, None] = None
+        self._tasks_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="task-prefetch"
+        )
         self.reset_tasks()
-        self.action_metric_pair = {}
-
-    def reset_tasks(self) -> None:
-        """Reset all tasks, regenerate key pairs and action lists"""
-        self._actions_idx = 0
+        self.action_metric_pair: List[Dict] = []
 
+    def _gen_tasks(self) -> Tuple[List[KeyPairPM], List[List[Dict]]]:
+        """Generate key pairs and action lists for one epoch"""
         # Generate key pairs
-        self.key_pairs = ch_utils.gen_key_pairs(
-            n_challenge=config.challenge.n_ch_per_epoch * config.challenge.n_run_per_ch,
-            key_size=config.api.security.asymmetric.key_size,
+        _key_pairs = ch_utils.gen_key_pairs(
+            n_challenge=_N_SESSIONS,
+            key_size=_KEY_SIZE,
+            executor=_keygen_executor,
         )
 
         # Generate challenge actions
-        self.challenges_action_list = ch_utils.gen_cb_actions(
-            n_challenge=config.challenge.n_ch_per_epoch,
-            window_width=config.challenge.window_width,
-            window_height=config.challenge.window_height,
-            n_checkboxes=config.challenge.n_checkboxes,
-            min_distance=config.challenge.cb_min_distance,
-            max_factor=config.challenge.cb_gen_max_factor,
-            checkbox_size=config.challenge.cb_size,
-            exclude_areas=config.challenge.cb_exclude_areas,
+        _challenges_action_list = ch_utils.gen_cb_actions(
+            n_challenge=_N_CH_PER_EPOCH,
+            **_CB_ACTIONS_KWARGS,
         )
 
+        return _key_pairs, _challenges_action_list
+
+    def _prefetch_tasks(self) -> None:
+        """Start generating the next epoch tasks in the background"""
+        self._next_tasks = self._tasks_executor.submit(self._gen_tasks)
+
+    def reset_tasks(self) -> None:
+        """Reset all tasks, take the prefetched key pairs and action lists"""
+        self._actions_idx = 0
+
+        # Tasks are random per epoch, so they are not reused, only generated ahead of time:
+        if self._next_tasks is None:
+            self._prefetch_tasks()
+
+        try:
+            _key_pairs, _challenges_action_list = self._next_tasks.result()
+            # Tasks are consumed from the front, deque makes it O(1):
+            self.key_pairs = deque(_key_pairs)
+            self.challenges_action_list = deque(_challenges_action_list)
+        finally:
+            self._prefetch_tasks()
+
         # Reset current task properties
         self.cur_key_pair = None
         self.cur_action_list = None
-        self.cur_score = None
-        self.action_metric_pair = {}
+        self.cur_action_list_json = None
+        self.clear_score()
+        self.action_metric_pair: List[Dict] = []
 
     def pop_task(self) -> Union[Tuple[KeyPairPM, List[Dict]], None]:
         """Get the next task (key pair and action list)"""
         if not self.key_pairs or not self.challenges_action_list:
             return None
 
-        self.cur_key_pair = self.key_pairs.pop(0)
-        self.cur_action_list = self.challenges_action_list.pop(0)
+        self.cur_key_pair = self.key_pairs.popleft()
+        self.cur_action_list = self.challenges_action_list.popleft()
+        # Serialized once per task, instead of on every web page render:
+        self.cur_action_list_json = _to_html_json(self.cur_action_list)
 
         return (self.cur_key_pair, self.cur_action_list)
 
@@ -114,13 +208,31 @@ class TaskManager:
 
     def record_metric(self, data: Dict) -> None:
         """Record a metric from the current session"""
-        num_finished_sessions = len(self.action_metric_pair.keys()) + 1
-        self.action_metric_pair[f"{num_finished_sessions}"] = data
+        self.action_metric_pair.append(data)
+
+    def get_action_metrics(self) -> Dict[str, Dict]:
+        """Get the recorded metrics keyed by session number, as expected by the metrics processor"""
+        return {
+            f"{_i}": _data for _i, _data in enumerate(self.action_metric_pair, start=1)
+        }
 
     def is_last_session(self) -> bool:
         """Check if this is the last session in the epoch"""
-        logger.info(f"Current session: {len(self.action_metric_pair.keys())}, ")
-        return len(self.action_metric_pair.keys()) == config.challenge.n_run_per_ch
+        logger.info(f"Current session: {len(self.action_metric_pair)}, ")
+        return len(self.action_metric_pair) == _N_RUN_PER_CH
+
+    def clear_score(self) -> None:
+        """Clear the current score before running a new bot"""
+        self.cur_score = None
+        self._score_event.clear()
+
+    def notify_score(self) -> None:
+        """Notify the waiting scorer that the current score is available"""
+        self._score_event.set()
+
+    def wait_score(self, timeout: float) -> bool:
+        """Wait until the current score is available, returns False on timeout"""
+        return self._score_event.wait(timeout=timeout)
 
     def get_nonce(self) -> str:
         _nonce_key: str = self.cur_key_pair.public_key
@@ -145,74 +257,106 @@ def get_task() -> MinerInput:
     return _miner_input
 
 
-@validate_call
+_BOT_IMAGE_CACHE_MAXSIZE = 4
+_bot_image_cache: "OrderedDict[str, None]" = OrderedDict()
+_docker_client: Union[docker.DockerClient, None] = None
+
+
+def _get_docker_client() -> docker.DockerClient:
+    """Get the shared docker client, created on first use"""
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
+
+def _prepare_bot_image(miner_output: MinerOutput) -> str:
+    """Build the bot image for the miner output, reuse it if it's already built"""
+    # Image is tagged by the miner output hash, so the same bot is built only once per process:
+    _bot_hash = hashlib.blake2b(
+        miner_output.model_dump_json().encode(), digest_size=16
+    ).hexdigest()
+    _image_name = f"bot:{_bot_hash}"
+    if _image_name in _bot_image_cache and _get_docker_client().images.list(
+        name=_image_name
+    ):
+        _bot_image_cache.move_to_end(_image_name)
+        logger.info(f"Using already built bot image '{_image_name}'.")
+        return _image_name
+
+    if miner_output.pip_requirements:
+        ch_utils.check_pip_requirements(
+            pip_requirements=miner_output.pip_requirements,
+            target_dt=config.challenge.allowed_pip_pkg_dt,
+        )
+
+    _build_dir = os.path.join(config.api.paths.tmp_dir, "bot")
+    ch_utils.copy_bot_files(
+        miner_output=miner_output,
+        src_dir=str(_src_dir / "bot"),
+        dst_dir=_build_dir,
+    )
+
+    ch_utils.build_bot_image(
+        build_dir=_build_dir,
+        system_deps=miner_output.system_deps,
+        image_name=_image_name,
+    )
+
+    _bot_image_cache[_image_name] = None
+    if _BOT_IMAGE_CACHE_MAXSIZE < len(_bot_image_cache):
+        _evicted_image_name, _ = _bot_image_cache.popitem(last=False)
+        try:
+            _get_docker_client().images.remove(image=_evicted_image_name, force=True)
+        except Exception as err:
+            logger.warning(
+                f"Failed to remove bot image '{_evicted_image_name}': {str(err)}!"
+            )
+
+    return _image_name
+
+
 def score(miner_output: MinerOutput) -> float:
     """Score the miner output"""
     _score = 0.0
-    _num_tasks = config.challenge.n_ch_per_epoch * config.challenge.n_run_per_ch
 
-    # Reset the task manager if needed
-    if not tm.has_remaining_tasks():
-        tm.reset_tasks()
+    with tm.lock:
+        # Reset the task manager if needed
+        if not tm.has_remaining_tasks():
+            tm.reset_tasks()
 
-    if tm.get_remaining_task_count() < _num_tasks:
-        tm.reset_tasks()
+        if tm.get_remaining_task_count() < _N_SESSIONS:
+            tm.reset_tasks()
 
     try:
         _container_name = "bot_container"
-        if miner_output.pip_requirements:
-            ch_utils.check_pip_requirements(
-                pip_requirements=miner_output.pip_requirements,
-                target_dt=config.challenge.allowed_pip_pkg_dt,
-            )
-
-        _build_dir = os.path.join(config.api.paths.tmp_dir, "bot")
-        ch_utils.copy_bot_files(
-            miner_output=miner_output,
-            src_dir=str(_src_dir / "bot"),
-            dst_dir=_build_dir,
-        )
-
-        _image_name = "bot:latest"
-        ch_utils.build_bot_image(
-            build_dir=_build_dir,
-            system_deps=miner_output.system_deps,
-            image_name=_image_name,
-        )
+        _image_name = _prepare_bot_image(miner_output=miner_output)
 
         # Get the next task
-        task = tm.pop_task()
-        tm.cur_score = None
+        with tm.lock:
+            task = tm.pop_task()
+            tm.clear_score()
         if not task:
             raise BaseHTTPException(
                 error_enum=ErrorCodeEnum.TOO_MANY_REQUESTS,
                 message=f"No initialized key pairs or action lists, or out of tasks!",
             )
 
-        _docker_client = docker.from_env()
         ch_utils.run_bot_container(
             action_list=tm.cur_action_list,
-            docker_client=_docker_client,
+            docker_client=_get_docker_client(),
             image_name=_image_name,
             container_name=_container_name,
             ulimit=config.challenge.docker_ulimit,
         )
 
-        _i = 0
-        while True:
-            if tm.cur_score is not None:
-                _score = tm.cur_score
-                tm.cur_score = None
-                logger.info("Successfully scored the miner output.")
-                break
-
-            logger.info(f"Waiting for the bot to finish... {tm.cur_score is not None}")
-            time.sleep(1)
-            _i += 1
-
-            if config.challenge.bot_timeout < _i:
-                logger.error("Timeout error: Bot running too long or failed to finish!")
-                break
+        logger.info("Waiting for the bot to finish...")
+        if tm.wait_score(timeout=config.challenge.bot_timeout):
+            _score = tm.cur_score
+            tm.clear_score()
+            logger.info("Successfully scored the miner output.")
+        else:
+            logger.error("Timeout error: Bot running too long or failed to finish!")
 
     except Exception as err:
         if isinstance(err, BaseHTTPException):
@@ -224,125 +368,124 @@ def score(miner_output: MinerOutput) -> float:
     return _score
 
 
-@validate_call(config={"arbitrary_types_allowed": True})
 def get_web(request: Request) -> HTMLResponse:
     """Get the web interface for the challenge"""
-    _nonce = None
-    if tm.cur_key_pair:
-        _nonce = tm.cur_key_pair.nonce
-    else:
-        _nonce = utils.gen_random_string()
-        logger.warning(
-            "Not initialized key pair, this endpoint is shouldn't be called directly!"
-        )
+    with tm.lock:
+        _nonce = None
+        if tm.cur_key_pair:
+            _nonce = tm.cur_key_pair.nonce
+        else:
+            _nonce = utils.gen_random_string()
+            logger.warning(
+                "Not initialized key pair, this endpoint is shouldn't be called directly!"
+            )
 
-    _action_list = []
-    if tm.cur_action_list:
-        _action_list = tm.cur_action_list
-    else:
-        _action_list = _TMP_ACTION_LIST
-        logger.warning(
-            "Not initialized action list, this endpoint is shouldn't be called directly!"
-        )
+        _action_list_json = None
+        if tm.cur_action_list:
+            _action_list_json = tm.cur_action_list_json
+        else:
+            _action_list_json = _TMP_ACTION_LIST_JSON
+            logger.warning(
+                "Not initialized action list, this endpoint is shouldn't be called directly!"
+            )
 
-    _key_pair: Tuple[str, str] = asymmetric_helper.gen_key_pair(
-        key_size=config.api.security.asymmetric.key_size, as_str=True
-    )
+    _key_pair: Tuple[str, str] = _get_web_key_pair()
     _, _public_key = _key_pair
-    _templates = Jinja2Templates(directory=(_src_dir / "./templates/html"))
     _html_response = _templates.TemplateResponse(
         request=request,
         name="index.html",
         context={
             "nonce": _nonce,
             "public_key": _public_key,
-            "actions_list": _action_list,
+            "actions_list_json": _action_list_json,
         },
     )
     return _html_response
 
 
-@validate_call
 def get_random_val(nonce: str) -> str:
     """Get the random value for the nonce"""
-    if not tm.cur_key_pair:
-        raise BaseHTTPException(
-            error_enum=ErrorCodeEnum.BAD_REQUEST,
-            message=f"Not initialized key pair or out of key pair, this endpoint is shouldn't be called directly!",
-        )
+    with tm.lock:
+        if not tm.cur_key_pair:
+            raise BaseHTTPException(
+                error_enum=ErrorCodeEnum.BAD_REQUEST,
+                message=f"Not initialized key pair or out of key pair, this endpoint is shouldn't be called directly!",
+            )
 
-    if tm.cur_key_pair.nonce != nonce:
-        raise BaseHTTPException(
-            error_enum=ErrorCodeEnum.UNAUTHORIZED,
-            message=f"Invalid nonce value!",
-        )
+        if tm.cur_key_pair.nonce != nonce:
+            raise BaseHTTPException(
+                error_enum=ErrorCodeEnum.UNAUTHORIZED,
+                message=f"Invalid nonce value!",
+            )
 
-    if not tm.cur_key_pair.public_key:
-        raise BaseHTTPException(
-            error_enum=ErrorCodeEnum.TOO_MANY_REQUESTS,
-            message=f"Nonce is already retrieved!",
-        )
+        if not tm.cur_key_pair.public_key:
+            raise BaseHTTPException(
+                error_enum=ErrorCodeEnum.TOO_MANY_REQUESTS,
+                message=f"Nonce is already retrieved!",
+            )
 
-    _nonce_key = tm.get_nonce()
+        _nonce_key = tm.get_nonce()
     return _nonce_key
 
 
-@validate_call
 def eval_bot(data: str) -> None:
     """Evaluate the bot performance"""
-    if not tm.cur_key_pair:
-        raise BaseHTTPException(
-            error_enum=ErrorCodeEnum.BAD_REQUEST,
-            message=f"Not initialized key pair or out of key pair, this endpoint is shouldn't be called directly!",
-        )
-
-    _private_key: str = tm.get_private_key()
-
-    logger.debug("Evaluating the bot...")
+    with tm.lock:
+        if not tm.cur_key_pair:
+            raise BaseHTTPException(
+                error_enum=ErrorCodeEnum.BAD_REQUEST,
+                message=f"Not initialized key pair or out of key pair, this endpoint is shouldn't be called directly!",
+            )
 
-    try:
-        _plaintext = ch_utils.decrypt(ciphertext=data, private_key=_private_key)
-        _plain_data = json.loads(_plaintext)
+        _private_key: str = tm.get_private_key()
 
-        # Record this metric
-        tm.record_metric(_plain_data)
+        logger.debug("Evaluating the bot...")
 
-        # If this is the last session, evaluate all metrics
-        if tm.is_last_session():
-            _metrics_processor = MetricsProcessor(
-                config={"actions": tm.cur_action_list}
-            )
-            _result = _metrics_processor(data=tm.action_metric_pair)
-            _cur_sesion_score = _result["analysis"]["score"]
-
-            logger.info(f"Bot evaluation result: {_result}")
-            if tm.cur_score is not None:
-                tm.cur_score += (
-                    _cur_sesion_score / config.challenge.n_ch_per_epoch
-                    if _cur_sesion_score != 0
-                    else 0
-                )
+        try:
+            _plaintext = ch_utils.decrypt(ciphertext=data, private_key=_private_key)
+            _plain_data = orjson.loads(_plaintext)
+
+            # Record this metric
+            tm.record_metric(_plain_data)
+
+            # If this is the last session, evaluate all metrics
+            if tm.is_last_session():
+                _result = _metrics_executor.submit(
+                    ch_utils.eval_metrics,
+                    action_list=tm.cur_action_list,
+                    action_metrics=tm.get_action_metrics(),
+                ).result()
+                _cur_sesion_score = _result["analysis"]["score"]
+
+                logger.info(f"Bot evaluation result: {_result}")
+                if tm.cur_score is not None:
+                    tm.cur_score += (
+                        _cur_sesion_score / _N_CH_PER_EPOCH
+                        if _cur_sesion_score != 0
+                        else 0
+                    )
+                else:
+                    tm.cur_score = (
+                        _cur_sesion_score / _N_CH_PER_EPOCH
+                        if _cur_sesion_score != 0
+                        else 0
+                    )
+                logger.info(f"Bot current score: {tm.cur_score}")
+                tm.notify_score()
+
+                # Reset for next epoch
+                tm.action_metric_pair = []
+                tm.cur_key_pair = None
+                tm.pop_task()
             else:
-                tm.cur_score = (
-                    _cur_sesion_score / config.challenge.n_ch_per_epoch
-                    if _cur_sesion_score != 0
-                    else 0
-                )
-            logger.info(f"Bot current score: {tm.cur_score}")
-
-            # Reset for next epoch
-            tm.action_metric_pair = {}
-            tm.cur_key_pair = None
-            tm.pop_task()
-        else:
-            tm.pop_task()
-        logger.debug("Successfully evaluated the bot.")
-    except Exception as err:
-        if isinstance(err, BaseHTTPException):
-            raise
+                tm.pop_task()
+            logger.debug("Successfully evaluated the bot.")
+        except Exception as err:
+            if isinstance(err, BaseHTTPException):
+                raise
 
-        logger.error(f"Failed to evaluate the bot: {str(err)}!")
-        raise
+            logger.error(f"Failed to evaluate the bot: {str(err)}!")
+            raise
 
     return
 
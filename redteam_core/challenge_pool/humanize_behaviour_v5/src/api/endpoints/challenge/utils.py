@@ -7,16 +7,23 @@ import shutil
 import random
 import requests
 import subprocess
+from concurrent.futures import Executor
 from datetime import datetime, timezone
 from typing import List, Dict, Union, Tuple, Optional
 
 from api.config import config
 import vault_unlock
 import docker
+import orjson
 from docker.models.networks import Network
 from docker import DockerClient
 from pydantic import validate_call
 
+try:
+    from modules.rt_hb_score import MetricsProcessor  # type: ignore
+except ImportError:
+    from rt_hb_score import MetricsProcessor  # type: ignore
+
 from api.core.constants import ErrorCodeEnum, ENV_PREFIX
 from api.core import utils
 from api.core.exceptions import BaseHTTPException
@@ -25,14 +32,19 @@ from api.endpoints.challenge.schemas import KeyPairPM, MinerOutput
 from api.logger import logger
 
 
-@validate_call
-def gen_key_pairs(n_challenge: int, key_size: int) -> List[KeyPairPM]:
+@validate_call(config={"arbitrary_types_allowed": True})
+def gen_key_pairs(
+    n_challenge: int, key_size: int, executor: Optional[Executor] = None
+) -> List[KeyPairPM]:
+
+    # RSA key generation is CPU-bound, so spread it over the executor processes when given:
+    _map = executor.map if executor else map
+    _str_key_pairs = _map(
+        asymmetric_helper.gen_key_pair, [key_size] * n_challenge, [True] * n_challenge
+    )
 
     _key_pairs: List[KeyPairPM] = []
-    for _ in range(n_challenge):
-        _key_pair: Tuple[str, str] = asymmetric_helper.gen_key_pair(
-            key_size=key_size, as_str=True
-        )
+    for _key_pair in _str_key_pairs:
         _private_key, _public_key = _key_pair
         _nonce = utils.gen_random_string(length=32)
         _key_pair_pm = KeyPairPM(
@@ -327,7 +339,7 @@ def run_bot_container(
             ulimits=[_ulimit_nofile],
             environment={
                 "TZ": "UTC",
-                f"{ENV_PREFIX}ACTION_LIST": action_list,
+                f"{ENV_PREFIX}ACTION_LIST": orjson.dumps(action_list).decode(),
                 f"{ENV_PREFIX}SESSION_COUNT": config.challenge.n_run_per_ch
                 * config.challenge.n_ch_per_epoch,
             },
@@ -355,6 +367,15 @@ def run_bot_container(
     return
 
 
+@validate_call
+def eval_metrics(action_list: List[Dict], action_metrics: Dict[str, Dict]) -> Dict:
+
+    # Module-level function, so it can be run in a worker process:
+    _metrics_processor = MetricsProcessor(config={"actions": action_list})
+    _result: Dict = _metrics_processor(data=action_metrics)
+    return _result
+
+
 @validate_call
 def decrypt(ciphertext: str, private_key: str) -> str:
 
@@ -371,5 +392,6 @@ __all__ = [
     "copy_bot_files",
     "build_bot_image",
     "run_bot_container",
+    "eval_metrics",
     "decrypt",
 ]
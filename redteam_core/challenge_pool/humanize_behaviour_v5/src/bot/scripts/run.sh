@@ -22,6 +22,7 @@ docker run \
 	-e HBC_WEB_URL="${HBC_WEB_URL:-http://172.17.0.1:10001/_web}" \
 	-e HBC_ACTION_LIST="${HBC_ACTION_LIST:-}" \
 	-e HBC_SESSION_COUNT="${HBC_SESSION_COUNT:-}" \
+	-e HBC_REUSE_DRIVER="${HBC_REUSE_DRIVER:-false}" \
 	bot:latest
 
 	# --network humanize_behaviour_v3_default \
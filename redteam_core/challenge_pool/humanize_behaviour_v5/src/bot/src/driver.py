@@ -24,35 +24,26 @@ class WebUIAutomate:
     _VIEWPORT_WIDTH = 1440
     _VIEWPORT_HEIGHT = 900
 
-    def __init__(self, web_url: HttpUrl):
+    def __init__(self, web_url: HttpUrl, reuse_driver: bool = False):
         """
         Initialize WebUI automation.
 
         Args:
-            web_url (str , required): URL to automate.
+            web_url      (str , required): URL to automate.
+            reuse_driver (bool, optional): Keep the browser open between runs, only clearing session data. Defaults to False.
         """
 
         self.web_url = web_url
+        self.reuse_driver = reuse_driver
         self.driver: Union[WebDriver, None] = None
 
     def setup_driver(self) -> None:
-        """Initialize Chrome WebDriver."""
+        """Initialize Chrome WebDriver (if not already running) and open the web URL."""
 
         try:
-            _options = webdriver.ChromeOptions()
-            _options.add_argument("--headless")
-            _options.add_argument("--no-sandbox")
-            _options.add_argument("--disable-gpu")
-            # _options.add_argument("--disable-dev-shm-usage")
-            _options.add_argument("--ignore-certificate-errors")
-            _options.add_argument(
-                f"--unsafely-treat-insecure-origin-as-secure={self.web_url}"
-            )
-            _options.add_argument(
-                f"--window-size={self._VIEWPORT_WIDTH},{self._VIEWPORT_HEIGHT}"
-            )
+            if not self.driver:
+                self.driver = self._create_driver()
 
-            self.driver = webdriver.Chrome(options=_options)
             self.driver.get(str(self.web_url))
             _wait = WebDriverWait(self.driver, 15)
 
@@ -69,6 +60,28 @@ class WebUIAutomate:
 
         return
 
+    def _create_driver(self) -> WebDriver:
+        """Start a new Chrome WebDriver.
+
+        Returns:
+            WebDriver: Chrome WebDriver instance.
+        """
+
+        _options = webdriver.ChromeOptions()
+        _options.add_argument("--headless")
+        _options.add_argument("--no-sandbox")
+        _options.add_argument("--disable-gpu")
+        # _options.add_argument("--disable-dev-shm-usage")
+        _options.add_argument("--ignore-certificate-errors")
+        _options.add_argument(
+            f"--unsafely-treat-insecure-origin-as-secure={self.web_url}"
+        )
+        _options.add_argument(
+            f"--window-size={self._VIEWPORT_WIDTH},{self._VIEWPORT_HEIGHT}"
+        )
+
+        return webdriver.Chrome(options=_options)
+
     def get_local_storage_data(self) -> Union[str, None]:
         """
         Get local storage data.
@@ -90,12 +103,31 @@ class WebUIAutomate:
             return None
 
     def cleanup(self) -> None:
-        """Cleanup resources."""
+        """Cleanup session data, and quit the browser unless it is reused."""
+
+        if self.driver:
+            try:
+                self.driver.delete_all_cookies()
+                self.driver.execute_script("window.localStorage.clear();")
+            except WebDriverException as err:
+                # Browser is in a bad state, don't reuse it
+                logger.warning(f"Failed to clear browser session data: {err}")
+                self.close()
+                return
+
+            if not self.reuse_driver:
+                self.close()
+
+        return
+
+    def close(self) -> None:
+        """Quit the browser."""
 
         if self.driver:
-            self.driver.delete_all_cookies()
-            self.driver.execute_script("window.localStorage.clear();")
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
 
         return
 
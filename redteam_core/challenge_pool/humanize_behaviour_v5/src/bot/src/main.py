@@ -5,8 +5,11 @@
 import os
 import sys
 import json
+import socket
+import struct
 import logging
 import subprocess
+from typing import Union
 
 ## Internal modules
 from constants import ENV_PREFIX
@@ -16,6 +19,31 @@ from driver import WebUIAutomate
 logger = logging.getLogger(__name__)
 
 
+def _get_default_gateway() -> Union[str, None]:
+    """Get default gateway IP address by reading '/proc/net/route' file.
+
+    Returns:
+        Union[str, None]: Default gateway IP address, or None if not found.
+    """
+
+    try:
+        with open("/proc/net/route", "r") as _file:
+            next(_file, None)  # Skip header line
+            for _line in _file:
+                _fields = _line.split()
+                # Default route: destination is 0.0.0.0 and RTF_GATEWAY (0x2) flag is set
+                if (
+                    (3 < len(_fields))
+                    and (_fields[1] == "00000000")
+                    and (int(_fields[3], 16) & 2)
+                ):
+                    return socket.inet_ntoa(struct.pack("<L", int(_fields[2], 16)))
+    except OSError:
+        pass
+
+    return None
+
+
 def main() -> None:
     logging.basicConfig(
         stream=sys.stdout,
@@ -26,16 +54,33 @@ def main() -> None:
 
     logger.info("Starting WebUI automation bot...")
 
+    _session_count = int(os.getenv(f"{ENV_PREFIX}SESSION_COUNT") or 2)
+    if _session_count < 1:
+        raise ValueError(
+            f"`{ENV_PREFIX}SESSION_COUNT` value '{_session_count}' is invalid, must be >= 1!"
+        )
+
     _web_url = os.getenv(f"{ENV_PREFIX}WEB_URL")
     if not _web_url:
-        _command = "ip route | awk '/default/ { print $3 }'"
-        _host = subprocess.check_output(_command, shell=True, text=True).strip()
+        _host = _get_default_gateway()
+        if not _host:
+            _command = "ip route | awk '/default/ { print $3 }'"
+            _host = subprocess.check_output(_command, shell=True, text=True).strip()
+
         _web_url = f"http://{_host}:10001/_web"
 
-    _session_count = os.getenv(f"{ENV_PREFIX}SESSION_COUNT")
-    for _ in range(int(_session_count) if _session_count else 2):
-        _webui_automate = WebUIAutomate(web_url=_web_url)
-        _webui_automate()
+    # Opt-in, sessions share one browser and only cookies/local storage are cleared between them:
+    _reuse_driver = os.getenv(f"{ENV_PREFIX}REUSE_DRIVER", "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    _webui_automate = WebUIAutomate(web_url=_web_url, reuse_driver=_reuse_driver)
+    try:
+        for _ in range(_session_count):
+            _webui_automate()
+    finally:
+        _webui_automate.close()
 
     logger.info("Done!\n")
     return
@@ -1,5 +1,5 @@
 import os
-import datetime
+import time
 from typing import Type, Tuple, Optional
 from typing_extensions import Self
 
@@ -218,11 +218,12 @@ class MainConfig(BaseSettings):
         if self.TESTNET:
             return True
 
-        today_closed_time = datetime.datetime.now(datetime.timezone.utc).replace(
-            hour=self.SCORING_HOUR, minute=0, second=0, microsecond=0
-        )
-        previous_day_closed_time = today_closed_time - datetime.timedelta(days=1)
-        return commit_timestamp < previous_day_closed_time.timestamp()
+        # Unix time has no leap seconds, so UTC days are whole multiples of 86400
+        # seconds and the closing time is plain arithmetic on today's day number.
+        _utc_day = int(time.time() // 86400)
+        _closing_offset = self.SCORING_HOUR * 3600
+        previous_day_closed_timestamp = (_utc_day - 1) * 86400 + _closing_offset
+        return commit_timestamp < previous_day_closed_timestamp
 
 
 constants = MainConfig(VERSION=__version__)
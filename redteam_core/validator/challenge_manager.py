@@ -263,11 +263,17 @@ class ChallengeManager:
             ):
                 scores[miner_state.miner_uid] = miner_state.best_commit.score
 
-        # Apply softmax
+        # Apply softmax over miners with a positive score only, zero-score UIDs would
+        # otherwise each add exp(0) to the denominator and dilute the real miners' share
         temperature = self.challenge_info.get("temperature", 0.2)
-        scaled_scores = scores / temperature
+        softmax_scores = np.zeros_like(scores)
+        mask_positive = scores > 0
+        if not np.any(mask_positive):
+            return softmax_scores
+
+        scaled_scores = scores[mask_positive] / temperature
         scores_exp = np.exp(scaled_scores - np.max(scaled_scores))
-        softmax_scores = scores_exp / np.sum(scores_exp)
+        softmax_scores[mask_positive] = scores_exp / np.sum(scores_exp)
 
         return softmax_scores
 